@@ -1,3 +1,3 @@
 # Agents module
-from .planner import ask_question
+from .planner import ask_question, aask_question, ask_question_stream, batch_ask
 from .retriever import retrieve_tool
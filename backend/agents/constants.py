@@ -0,0 +1,10 @@
+"""
+Agent Constants
+
+Settings shared by the planner and the retriever tool. Kept in their own
+module so the retriever (a small LangChain tool) doesn't have to import
+the whole planner and its LLM clients just to read them.
+"""
+
+# Questions shorter than this (after stripping) skip embedding, search and the LLM
+MIN_QUESTION_LENGTH = 3
@@ -2,7 +2,7 @@
 Planner Agent - The Brain of the Agentic RAG System
 
 Supports multiple LLM providers:
-1. Google Gemini 2.0 Flash (Primary)
+1. Google Gemini 2.5 Flash (Primary)
 2. OpenRouter (Fallback - supports many models)
 
 Key Concept: RAG (Retrieval-Augmented Generation)
@@ -10,29 +10,160 @@ Key Concept: RAG (Retrieval-Augmented Generation)
 1. Search for relevant documents
 2. Pass them to the LLM as context
 3. LLM generates answer based on context
+
+Why not a ReAct agent loop?
+----------------------------
+With a single tool (document search), a Thought/Action/Observation loop
+just spends extra LLM round-trips deciding to call that one tool. We
+retrieve once and make a single answer-generation call instead.
 """
 
 import google.generativeai as genai
-from backend.rag.search import search_documents
+from google.api_core import exceptions as google_exceptions
+from backend.rag.search import search_documents, embed_query
+from backend.rag.semantic_cache import answer_cache
+from backend.agents.validator import avalidate_answer
+from backend.agents.constants import MIN_QUESTION_LENGTH
+from backend.db.chroma import get_collection, get_qa_cache_collection
 import os
+import asyncio
+import copy
+import functools
+import hashlib
+import json
+import logging
+from typing import Iterator, List, Optional
 from dotenv import load_dotenv
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+GEMINI_MODEL = "gemini-2.5-flash"
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+# Provider errors worth retrying (rate limits and transient server failures)
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# Prompt size limits - tune for your provider's context window / cost profile
+MAX_CHUNK_CHARS = 1200     # Max characters kept from each retrieved chunk
+MAX_CONTEXT_CHARS = 8000   # Max characters of retrieved context in the prompt
 
+# Answer-generation prompt, filled in with str.format for each question
+ANSWER_PROMPT = """You are an expert AI assistant helping users understand documents.
+Provide clear, well-structured answers based on the provided context.
+
+CONTEXT FROM DOCUMENTS:
+{context}
+
+USER QUESTION: {question}
+
+INSTRUCTIONS:
+1. Answer based ONLY on the context provided above
+2. Structure your response clearly with bullet points or numbered lists when appropriate
+3. If explaining a process or requirements, break it down into clear steps
+4. Be comprehensive but avoid unnecessary repetition
+5. If the context doesn't contain enough information, clearly state what's missing
+6. Do NOT mention temporary file paths - just say "the documents" or use the original filename if visible
+
+RESPONSE:"""
+
+# Shared HTTP session for OpenRouter calls.
+# Reusing one session keeps the TCP+TLS connection alive between requests,
+# so consecutive fallback calls skip the handshake to openrouter.ai.
+# Transient failures are retried with exponential backoff inside the adapter
+# (urllib3 also honours the Retry-After header on 429/503), so the caller
+# never has to re-run retrieval just because the provider hiccuped.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=["POST"],  # POST is not retried by default
+        respect_retry_after_header=True,
+        raise_on_status=False  # Let the status check below build the error message
+    )
+))
+
+# Gemini signals rate limits / overload with these exceptions
+_gemini_retry = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=1, max=10),
+    retry=retry_if_exception_type((
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable
+    )),
+    reraise=True
+)
+
+
+class _TransientHTTPError(Exception):
+    """Retryable HTTP status returned by an async provider call"""
+
+
+# The aiohttp path has no urllib3 adapter, so retry it with tenacity instead
+_async_http_retry = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential_jitter(initial=0.5, max=10),
+    retry=retry_if_exception_type((
+        _TransientHTTPError,
+        aiohttp.ClientConnectionError,
+        asyncio.TimeoutError
+    )),
+    reraise=True
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _openrouter_headers(api_key: str) -> dict:
+    """Build the static OpenRouter request headers once per API key"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "HTTP-Referer": "http://localhost:3000",  # Optional but recommended
+        "X-Title": "Agentic RAG System",  # Optional but recommended
+        "Content-Type": "application/json"
+    }
+
+
+@functools.lru_cache(maxsize=4)
+def _get_gemini_model(model_name: str, api_key: str):
+    """Configure the Gemini SDK and build the model once per (model, key)"""
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+
+@_gemini_retry
 def get_gemini_response(prompt: str) -> str:
     """Get response from Google Gemini"""
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise ValueError("GOOGLE_API_KEY not found")
     
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.5-flash')
+    model = _get_gemini_model(GEMINI_MODEL, api_key)
     response = model.generate_content(prompt)
     return response.text
 
 
+def _error_detail(content: bytes):
+    """Decode an error response body (JSON if possible, raw text otherwise)"""
+    if not content:
+        return "No error details"
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return content.decode("utf-8", errors="replace")
+
+
 def get_openrouter_response(prompt: str, model: str = "mistralai/mistral-nemo") -> str:
     """
     Get response from OpenRouter (fallback option)
@@ -50,33 +181,29 @@ def get_openrouter_response(prompt: str, model: str = "mistralai/mistral-nemo")
         raise ValueError("OPENROUTER_API_KEY not found in .env file")
     
     try:
-        response = requests.post(
-            url="https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "HTTP-Referer": "http://localhost:3000",  # Optional but recommended
-                "X-Title": "Agentic RAG System",  # Optional but recommended
-                "Content-Type": "application/json"
-            },
-            json={
+        # orjson encodes/decodes the (context-heavy) bodies much faster than stdlib json
+        response = _SESSION.post(
+            url=OPENROUTER_URL,
+            headers=_openrouter_headers(api_key),
+            data=orjson.dumps({
                 "model": model,
                 "messages": [
                     {"role": "user", "content": prompt}
                 ]
-            },
+            }),
             timeout=30
         )
         
         if response.status_code != 200:
-            error_detail = response.json() if response.text else "No error details"
+            error_detail = _error_detail(response.content)
             raise Exception(f"OpenRouter API error (status {response.status_code}): {error_detail}")
         
-        result = response.json()
+        result = orjson.loads(response.content)
         return result["choices"][0]["message"]["content"]
         
     except requests.exceptions.RequestException as e:
         raise Exception(f"OpenRouter request failed: {str(e)}")
-    except KeyError as e:
+    except (KeyError, orjson.JSONDecodeError) as e:
         raise Exception(f"Unexpected OpenRouter response format: {str(e)}")
 
 
@@ -98,7 +225,7 @@ def get_llm_response(prompt: str, provider: str = "auto") -> str:
         return get_openrouter_response(prompt)
     else:  # auto
         try:
-            print("   [LLM] Using Google Gemini 2.0 Flash...")
+            print("   [LLM] Using Google Gemini 2.5 Flash...")
             return get_gemini_response(prompt)
         except Exception as e:
             print(f"   [WARN] Gemini failed: {e}")
@@ -106,7 +233,350 @@ def get_llm_response(prompt: str, provider: str = "auto") -> str:
             return get_openrouter_response(prompt)
 
 
-def ask_question(question: str, verbose: bool = True, provider: str = "auto") -> dict:
+def stream_gemini_response(prompt: str) -> Iterator[str]:
+    """Stream response text from Google Gemini as it is generated"""
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY not found")
+    
+    model = _get_gemini_model(GEMINI_MODEL, api_key)
+    for chunk in model.generate_content(prompt, stream=True):
+        if chunk.text:
+            yield chunk.text
+
+
+def stream_openrouter_response(prompt: str, model: str = "mistralai/mistral-nemo") -> Iterator[str]:
+    """Stream response text from OpenRouter (parses its SSE frames)"""
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        raise ValueError("OPENROUTER_API_KEY not found in .env file")
+    
+    try:
+        with _SESSION.post(
+            url=OPENROUTER_URL,
+            headers=_openrouter_headers(api_key),
+            data=orjson.dumps({
+                "model": model,
+                "messages": [
+                    {"role": "user", "content": prompt}
+                ],
+                "stream": True
+            }),
+            timeout=30,
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                error_detail = _error_detail(response.content)
+                raise Exception(f"OpenRouter API error (status {response.status_code}): {error_detail}")
+            
+            # Frames are parsed as bytes - orjson decodes them without a str round-trip
+            for line in response.iter_lines():
+                # Skip keep-alive blank lines and SSE comments (": OPENROUTER PROCESSING")
+                if not line or not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:"):].strip()
+                if data == b"[DONE]":
+                    break
+                
+                delta = orjson.loads(data)["choices"][0].get("delta", {})
+                if delta.get("content"):
+                    yield delta["content"]
+        
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"OpenRouter request failed: {str(e)}")
+    except (KeyError, IndexError, ValueError) as e:
+        raise Exception(f"Unexpected OpenRouter response format: {str(e)}")
+
+
+def stream_llm_response(prompt: str, provider: str = "auto") -> Iterator[str]:
+    """
+    Stream LLM response text with automatic fallback.
+    
+    In "auto" mode we fall back to OpenRouter only if Gemini fails before
+    producing any text - once tokens have been sent they can't be taken back.
+    """
+    if provider == "gemini":
+        yield from stream_gemini_response(prompt)
+    elif provider == "openrouter":
+        yield from stream_openrouter_response(prompt)
+    else:  # auto
+        started = False
+        try:
+            print("   [LLM] Streaming from Google Gemini 2.5 Flash...")
+            for text in stream_gemini_response(prompt):
+                started = True
+                yield text
+        except Exception as e:
+            if started:
+                raise
+            print(f"   [WARN] Gemini failed: {e}")
+            print("   [LLM] Falling back to OpenRouter...")
+            yield from stream_openrouter_response(prompt)
+
+
+# Shared aiohttp session for async OpenRouter calls.
+# aiohttp sessions are bound to the event loop they were created in,
+# so the session is created lazily and recreated if the loop changes.
+_AIOHTTP_SESSION: Optional[aiohttp.ClientSession] = None
+_AIOHTTP_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_aiohttp_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session for the running event loop"""
+    global _AIOHTTP_SESSION, _AIOHTTP_LOOP
+    loop = asyncio.get_running_loop()
+    if _AIOHTTP_SESSION is None or _AIOHTTP_SESSION.closed or _AIOHTTP_LOOP is not loop:
+        _AIOHTTP_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60)
+        )
+        _AIOHTTP_LOOP = loop
+    return _AIOHTTP_SESSION
+
+
+async def close_async_clients():
+    """Close the shared aiohttp session (call on application shutdown)"""
+    global _AIOHTTP_SESSION
+    if _AIOHTTP_SESSION is not None and not _AIOHTTP_SESSION.closed:
+        await _AIOHTTP_SESSION.close()
+    _AIOHTTP_SESSION = None
+
+
+@_gemini_retry
+async def aget_gemini_response(prompt: str) -> str:
+    """Async version of get_gemini_response"""
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY not found")
+    
+    model = _get_gemini_model(GEMINI_MODEL, api_key)
+    response = await model.generate_content_async(prompt)
+    return response.text
+
+
+@_async_http_retry
+async def _apost_openrouter(api_key: str, payload: dict) -> dict:
+    """POST a chat completion to OpenRouter, retrying transient failures"""
+    async with _get_aiohttp_session().post(
+        OPENROUTER_URL,
+        headers=_openrouter_headers(api_key),
+        data=orjson.dumps(payload),
+        timeout=aiohttp.ClientTimeout(total=30)
+    ) as response:
+        if response.status != 200:
+            error_detail = _error_detail(await response.read())
+            message = f"OpenRouter API error (status {response.status}): {error_detail}"
+            if response.status in RETRY_STATUSES:
+                raise _TransientHTTPError(message)
+            raise Exception(message)
+        
+        return orjson.loads(await response.read())
+
+
+async def aget_openrouter_response(prompt: str, model: str = "mistralai/mistral-nemo") -> str:
+    """Async version of get_openrouter_response"""
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        raise ValueError("OPENROUTER_API_KEY not found in .env file")
+    
+    try:
+        result = await _apost_openrouter(api_key, {
+            "model": model,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ]
+        })
+        return result["choices"][0]["message"]["content"]
+        
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise Exception(f"OpenRouter request failed: {str(e)}")
+    except (KeyError, orjson.JSONDecodeError) as e:
+        raise Exception(f"Unexpected OpenRouter response format: {str(e)}")
+
+
+async def aget_llm_response(prompt: str, provider: str = "auto") -> str:
+    """Async version of get_llm_response (same provider/fallback rules)"""
+    if provider == "gemini":
+        return await aget_gemini_response(prompt)
+    elif provider == "openrouter":
+        return await aget_openrouter_response(prompt)
+    else:  # auto
+        try:
+            print("   [LLM] Using Google Gemini 2.5 Flash...")
+            return await aget_gemini_response(prompt)
+        except Exception as e:
+            print(f"   [WARN] Gemini failed: {e}")
+            print("   [LLM] Falling back to OpenRouter...")
+            return await aget_openrouter_response(prompt)
+
+
+def _qa_cache_get(question_embedding) -> Optional[dict]:
+    """Look up the persistent (ChromaDB) answer cache. Returns None on a miss."""
+    collection = get_qa_cache_collection()
+    if collection.count() == 0:
+        return None
+
+    hits = collection.query(
+        query_embeddings=[list(question_embedding)],
+        n_results=1,
+        include=["metadatas", "distances"]
+    )
+    if not hits["ids"][0]:
+        return None
+
+    # Cosine distance = 1 - cosine similarity
+    if hits["distances"][0][0] > 1 - answer_cache.threshold:
+        return None
+
+    meta = hits["metadatas"][0][0]
+    return {
+        "output": meta["answer"],
+        "context": meta["context"],
+        "sources": json.loads(meta["sources_json"])
+    }
+
+
+def _qa_cache_put(question: str, question_embedding, result: dict):
+    """Store an answer in the persistent (ChromaDB) answer cache"""
+    get_qa_cache_collection().upsert(
+        ids=[hashlib.blake2b(question.encode()).hexdigest()],
+        embeddings=[list(question_embedding)],
+        documents=[question],
+        metadatas=[{
+            "answer": result["output"],
+            "context": result["context"],
+            "sources_json": json.dumps(result["sources"])
+        }]
+    )
+
+
+def _lookup_cache(question: str, provider: str = "auto", lookup: bool = True):
+    """
+    Look the question up in the in-process semantic cache, then the
+    persistent one (which survives restarts).
+    
+    Cached answers don't record which LLM wrote them, so a request for a
+    specific provider bypasses the caches entirely (it is neither served
+    nor stored).
+    
+    Args:
+        lookup: If False, only embed the question (so a fresh answer can
+                still be cached) without consulting the caches
+    
+    Returns:
+        (question_embedding, cached_result) - either may be None; the
+        cached result is a copy the caller may modify
+    """
+    if provider != "auto":
+        return None, None
+
+    try:
+        question_embedding = embed_query(question)
+    except Exception as e:
+        logger.warning("[WARN] Semantic cache lookup failed: %s", e)
+        return None, None
+
+    if not lookup:
+        return question_embedding, None
+
+    cached = answer_cache.get(question_embedding)
+    if cached is not None:
+        return question_embedding, copy.deepcopy(cached)
+
+    try:
+        cached = _qa_cache_get(question_embedding)
+    except Exception as e:
+        logger.warning("[WARN] Persistent answer cache lookup failed: %s", e, exc_info=True)
+        cached = None
+
+    if cached is not None:
+        answer_cache.put(question_embedding, copy.deepcopy(cached))
+    return question_embedding, cached
+
+
+def _cache_result(question: str, question_embedding, result: dict):
+    """
+    Store a successful answer in both answer caches.
+    
+    A copy is cached, so the caller can keep modifying its result.
+    """
+    if question_embedding is None:
+        return
+
+    answer_cache.put(question_embedding, copy.deepcopy(result))
+    try:
+        _qa_cache_put(question, question_embedding, result)
+    except Exception as e:
+        logger.warning("[WARN] Could not persist answer to cache: %s", e)
+
+
+def _format_context(search_results: list):
+    """
+    Format search results into LLM context and a deduplicated source list.
+    
+    To keep prompt tokens down:
+    - Near-duplicate chunks (same leading text) are only included once
+    - Each chunk is truncated to MAX_CHUNK_CHARS
+    - Chunks stop being added once the context reaches MAX_CONTEXT_CHARS
+    
+    Returns:
+        (context, sources)
+    """
+    # (filename, page, content) per result; the first of any repeated chunk wins
+    # (Chroma often returns overlapping chunks)
+    unique = {}
+    for r in search_results:
+        content = r['content']
+        fingerprint = hashlib.blake2b(content[:256].encode(), digest_size=16).digest()
+        if fingerprint not in unique:
+            unique[fingerprint] = (
+                os.path.basename(r['metadata'].get('source', 'unknown')),
+                r['metadata'].get('page', ''),
+                content[:MAX_CHUNK_CHARS]
+            )
+    parts = list(unique.values())
+
+    citations = [f"[Source: {s}{f', Page {p}' if p else ''}]" for s, p, _ in parts]
+
+    # Documents are formatted lazily, so results past the context budget
+    # are never turned into strings at all (matters with large n_results)
+    documents = (
+        f"Document {i}:\n{c}\n{citation}"
+        for i, ((_, _, c), citation) in enumerate(zip(parts, citations), 1)
+    )
+    context_parts = list(_within_budget(documents, MAX_CONTEXT_CHARS))
+
+    # str.join sizes the result once and copies each part once
+    context = "\n\n---\n\n".join(context_parts)
+    # dict.fromkeys de-duplicates sources while keeping their order
+    sources = list(dict.fromkeys(citations[:len(context_parts)]))
+    return context, sources
+
+
+def _within_budget(parts: Iterator[str], max_chars: int) -> Iterator[str]:
+    """Yield parts until the next one would exceed max_chars (always yields at least one)"""
+    total = 0
+    for part in parts:
+        if total and total + len(part) > max_chars:
+            return
+        total += len(part)
+        yield part
+
+
+NO_RESULTS_ANSWER = "I couldn't find any relevant information in the documents."
+
+SHORT_QUESTION_ANSWER = "Please provide a question with at least a few characters."
+
+
+def _is_too_short(question: str) -> bool:
+    return len(question.strip()) < MIN_QUESTION_LENGTH
+
+
+def ask_question(
+    question: str,
+    verbose: bool = True,
+    provider: str = "auto",
+    prefetched_context: Optional[List[dict]] = None
+) -> dict:
     """
     Ask a question using the RAG system.
     
@@ -114,59 +584,48 @@ def ask_question(question: str, verbose: bool = True, provider: str = "auto") ->
         question: The user's question
         verbose: Whether to print the thinking process
         provider: "gemini", "openrouter", or "auto"
+        prefetched_context: search_documents() results the caller already has
+                            (e.g. to show sources first); skips our own search
         
     Returns:
         dict with 'output' (answer), 'context' (retrieved docs), and 'sources'
     """
     
+    if _is_too_short(question):
+        return {"output": SHORT_QUESTION_ANSWER, "context": "", "sources": []}
+
+    # Step 0: Check the semantic cache for an equivalent question.
+    # Not when the caller already searched: a cached answer (and its
+    # sources) may come from an older document set than that context.
+    question_embedding, cached = _lookup_cache(
+        question, provider, lookup=prefetched_context is None
+    )
+
+    if cached is not None:
+        if verbose:
+            logger.info("[CACHE] Returning cached answer for a similar question")
+        return cached
+
     if verbose:
         print("\n" + "="*60)
         print("[STEP 1] SEARCHING DOCUMENTS")
         print("="*60)
     
     # Step 1: Retrieve relevant documents
-    search_results = search_documents(question, n_results=5)
+    if prefetched_context is not None:
+        search_results = prefetched_context
+    else:
+        search_results = search_documents(question, n_results=5)
     
     if not search_results:
         return {
-            "output": "I couldn't find any relevant information in the documents.",
+            "output": NO_RESULTS_ANSWER,
             "context": "",
             "sources": []
         }
     
     # Format context for the LLM
-    context_parts = []
-    sources = []
-    seen_sources = set()
-
-    for i, result in enumerate(search_results, 1):
-        content = result['content']
-        source = result['metadata'].get('source', 'unknown')
-        page = result['metadata'].get('page', '')
-
-        # Clean up source path - extract just filename
-        import os
-        if os.sep in source or '/' in source:
-            source = os.path.basename(source)
-            
-        # Clean up any potential temp prefixes if they still exist (though new ingestion method prevents this)
-        # We prefer the actual filename now
-
-
-        citation = f"[Source: {source}"
-        if page:
-            citation += f", Page {page}"
-        citation += "]"
-
-        context_parts.append(f"Document {i}:\n{content}\n{citation}")
-
-        # Avoid duplicate sources in the list
-        source_key = f"{source}:{page}"
-        if source_key not in seen_sources:
-            sources.append(citation)
-            seen_sources.add(source_key)
-    
-    context = "\n\n---\n\n".join(context_parts)
+    context, sources = _format_context(search_results)
     
     if verbose:
         print(f"\n   [OK] Found {len(search_results)} relevant chunks")
@@ -175,37 +634,247 @@ def ask_question(question: str, verbose: bool = True, provider: str = "auto") ->
         print("="*60)
     
     # Step 2: Generate answer using LLM
-    prompt = f"""You are an expert AI assistant helping users understand documents.
-Provide clear, well-structured answers based on the provided context.
+    prompt = ANSWER_PROMPT.format(context=context, question=question)
+    
+    try:
+        answer = get_llm_response(prompt, provider=provider)
+    except Exception as e:
+        if verbose:
+            print(f"\n[ERROR] Error generating answer: {e}")
+        return {
+            "output": f"Error: Could not generate answer. {str(e)}",
+            "context": context,
+            "sources": sources
+        }
+    
+    result = {
+        "output": answer,
+        "context": context,
+        "sources": sources
+    }
 
-CONTEXT FROM DOCUMENTS:
-{context}
+    # Only successful answers are cached
+    _cache_result(question, question_embedding, result)
 
-USER QUESTION: {question}
+    return result
 
-INSTRUCTIONS:
-1. Answer based ONLY on the context provided above
-2. Structure your response clearly with bullet points or numbered lists when appropriate
-3. If explaining a process or requirements, break it down into clear steps
-4. Be comprehensive but avoid unnecessary repetition
-5. If the context doesn't contain enough information, clearly state what's missing
-6. Do NOT mention temporary file paths - just say "the documents" or use the original filename if visible
 
-RESPONSE:"""
+async def aask_question(
+    question: str,
+    verbose: bool = False,
+    provider: str = "auto",
+    rate_limiter: Optional["AsyncLeakyBucket"] = None,
+    validate: bool = False,
+    await_validation: bool = True
+) -> dict:
+    """
+    Async version of ask_question.
+    
+    Embedding and vector search run in a worker thread; the LLM call uses the
+    provider's async client. This lets callers answer many questions at once:
+    
+        results = await asyncio.gather(*[aask_question(q) for q in questions])
+    
+    Args:
+        rate_limiter: Optional AsyncLeakyBucket acquired before the LLM call
+        validate: Also fact-check the answer against the context. The validator
+                  call starts as soon as the answer arrives and runs alongside
+                  the remaining post-processing.
+        await_validation: If True, 'validation' holds the validator's result dict.
+                          If False, it holds the running asyncio.Task so the
+                          caller can return the answer first and await it later.
     
+    Returns:
+        Same dict as ask_question, plus 'validation' when validate=True
+    """
+    if _is_too_short(question):
+        return {"output": SHORT_QUESTION_ANSWER, "context": "", "sources": []}
+
+    question_embedding, cached = await asyncio.to_thread(_lookup_cache, question, provider)
+
+    if cached is not None:
+        if verbose:
+            logger.info("[CACHE] Returning cached answer for a similar question")
+        return cached
+
+    search_results = await asyncio.to_thread(search_documents, question, 5)
+
+    if not search_results:
+        return {
+            "output": NO_RESULTS_ANSWER,
+            "context": "",
+            "sources": []
+        }
+
+    context, sources = _format_context(search_results)
+    prompt = ANSWER_PROMPT.format(context=context, question=question)
+
     try:
-        answer = get_llm_response(prompt, provider=provider)
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        answer = await aget_llm_response(prompt, provider=provider)
     except Exception as e:
         if verbose:
             print(f"\n[ERROR] Error generating answer: {e}")
-        answer = f"Error: Could not generate answer. {str(e)}"
-    
-    return {
+        return {
+            "output": f"Error: Could not generate answer. {str(e)}",
+            "context": context,
+            "sources": sources
+        }
+
+    validation_task = None
+    if validate:
+        validation_task = asyncio.create_task(avalidate_answer(answer, context))
+
+    result = {
         "output": answer,
         "context": context,
         "sources": sources
     }
 
+    # The cache write is a blocking ChromaDB upsert; keep it off the event loop
+    await asyncio.to_thread(_cache_result, question, question_embedding, result)
+
+    if validation_task is None:
+        return result
+
+    # Copy so the cached result never carries a validation task
+    result = dict(result)
+    if not await_validation:
+        result["validation"] = validation_task
+        return result
+
+    try:
+        result["validation"] = await validation_task
+    except Exception as e:
+        result["validation"] = {"is_valid": False, "explanation": f"Validation failed: {str(e)}"}
+    return result
+
+
+def ask_question_stream(question: str, provider: str = "auto") -> Iterator[dict]:
+    """
+    Streaming version of ask_question.
+    
+    Yields events as they become available:
+    - {"type": "sources", "sources": [...]} - once, before any answer text
+    - {"type": "token", "text": "..."}      - answer text as it is generated
+    - {"type": "error", "message": "..."}   - if the LLM call fails
+    
+    Sources are sent first so a UI can render them while the answer streams in.
+    """
+    if _is_too_short(question):
+        yield {"type": "sources", "sources": []}
+        yield {"type": "token", "text": SHORT_QUESTION_ANSWER}
+        return
+
+    question_embedding, cached = _lookup_cache(question, provider)
+
+    if cached is not None:
+        yield {"type": "sources", "sources": cached["sources"]}
+        yield {"type": "token", "text": cached["output"]}
+        return
+
+    search_results = search_documents(question, n_results=5)
+
+    if not search_results:
+        yield {"type": "sources", "sources": []}
+        yield {"type": "token", "text": NO_RESULTS_ANSWER}
+        return
+
+    context, sources = _format_context(search_results)
+    yield {"type": "sources", "sources": sources}
+
+    prompt = ANSWER_PROMPT.format(context=context, question=question)
+    answer_parts = []
+    try:
+        for text in stream_llm_response(prompt, provider=provider):
+            answer_parts.append(text)
+            yield {"type": "token", "text": text}
+    except Exception as e:
+        yield {"type": "error", "message": f"Could not generate answer. {str(e)}"}
+        return
+
+    _cache_result(question, question_embedding, {
+        "output": "".join(answer_parts),
+        "context": context,
+        "sources": sources
+    })
+
+
+class AsyncLeakyBucket:
+    """
+    Minimal async rate limiter: lets through at most `rpm` acquisitions per minute,
+    evenly spaced (one every 60/rpm seconds).
+    """
+
+    def __init__(self, rpm: int):
+        if rpm <= 0:
+            raise ValueError("rpm must be positive")
+        self.interval = 60.0 / rpm
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+async def batch_ask(
+    questions: List[str],
+    max_concurrency: int = 8,
+    rpm: Optional[int] = None,
+    provider: str = "auto"
+) -> list:
+    """
+    Answer many questions concurrently.
+    
+    Args:
+        questions: The questions to answer
+        max_concurrency: Maximum number of questions in flight at once
+        rpm: Optional cap on LLM requests per minute (provider rate limit)
+        provider: "gemini", "openrouter", or "auto"
+    
+    Returns:
+        One entry per question, in input order: the ask_question result dict,
+        or the exception raised for that question (one failure doesn't
+        abort the rest of the batch)
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+    rate_limiter = AsyncLeakyBucket(rpm) if rpm else None
+
+    async def ask_one(question: str) -> dict:
+        async with sem:
+            return await aask_question(question, provider=provider, rate_limiter=rate_limiter)
+
+    return await asyncio.gather(*[ask_one(q) for q in questions], return_exceptions=True)
+
+
+def warmup():
+    """
+    Pay one-time start-up costs before the first request arrives.
+    
+    Opens ChromaDB and its HNSW index, loads the embedding model, and builds
+    the Gemini client. Failures are logged, not raised - the server can
+    still start and these costs are just paid by the first request instead.
+    """
+    try:
+        collection = get_collection("rag_collection")
+        embedding = embed_query("warmup")
+        if collection.count() > 0:
+            collection.query(query_embeddings=[list(embedding)], n_results=1, include=["distances"])
+        
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if api_key:
+            _get_gemini_model(GEMINI_MODEL, api_key)
+        
+        logger.info("[OK] Warmup complete")
+    except Exception as e:
+        logger.warning("[WARN] Warmup failed: %s", e)
+
 
 if __name__ == "__main__":
     # Test the agent
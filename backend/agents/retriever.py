@@ -20,6 +20,7 @@ The @tool decorator makes our function callable by the agent.
 from langchain_core.tools import tool
 from typing import List, Dict, Any
 from backend.rag.search import search_documents
+from backend.agents.constants import MIN_QUESTION_LENGTH
 
 
 @tool
@@ -36,6 +37,10 @@ def retrieve_tool(query: str) -> str:
     Returns:
         A formatted string containing relevant document chunks with sources
     """
+    # Don't spend an embedding + vector search on an empty/trivial query
+    if len(query.strip()) < MIN_QUESTION_LENGTH:
+        return "Please provide a search query with at least a few characters."
+    
     # Perform the search
     results = search_documents(query, n_results=5)
     
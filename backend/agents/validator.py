@@ -16,7 +16,6 @@ This is a simple implementation - in production, you might use:
 """
 
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
 import os
 from dotenv import load_dotenv
 
@@ -41,6 +40,19 @@ Respond with:
 Your response:"""
 
 
+# Build the LLM client once at import instead of on every validation call.
+# The prompt is filled in with plain str.format - a ChatPromptTemplate would
+# re-validate its inputs on every call for no benefit here.
+_LLM = None
+
+if os.getenv("GOOGLE_API_KEY"):
+    _LLM = ChatGoogleGenerativeAI(
+        model="gemini-1.5-flash",
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+        temperature=0
+    )
+
+
 def validate_answer(answer: str, context: str) -> dict:
     """
     Validate if an answer is grounded in the retrieved context.
@@ -52,22 +64,38 @@ def validate_answer(answer: str, context: str) -> dict:
     Returns:
         dict with 'is_valid' (bool) and 'explanation' (str)
     """
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
+    if not answer.strip():
+        return {"is_valid": False, "explanation": "Validation skipped (empty answer)"}
+    
+    if _LLM is None:
         # Skip validation if no API key
         return {"is_valid": True, "explanation": "Validation skipped (no API key)"}
     
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-1.5-flash",
-        google_api_key=api_key,
-        temperature=0
-    )
+    result = _LLM.invoke(VALIDATION_PROMPT.format(context=context, answer=answer))
+    return _parse_validation(result.content)
+
+
+async def avalidate_answer(answer: str, context: str) -> dict:
+    """
+    Async version of validate_answer.
     
-    prompt = ChatPromptTemplate.from_template(VALIDATION_PROMPT)
-    chain = prompt | llm
+    Lets the caller run validation concurrently with other work
+    (e.g. asyncio.create_task right after the answer is generated).
+    """
+    if not answer.strip():
+        return {"is_valid": False, "explanation": "Validation skipped (empty answer)"}
     
-    result = chain.invoke({"context": context, "answer": answer})
-    response = result.content.strip()
+    if _LLM is None:
+        # Skip validation if no API key
+        return {"is_valid": True, "explanation": "Validation skipped (no API key)"}
+    
+    result = await _LLM.ainvoke(VALIDATION_PROMPT.format(context=context, answer=answer))
+    return _parse_validation(result.content)
+
+
+def _parse_validation(response: str) -> dict:
+    """Turn the fact-checker's reply into the validation result dict"""
+    response = response.strip()
     
     is_valid = response.startswith("VALID")
     
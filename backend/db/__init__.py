@@ -1,2 +1,3 @@
 # Database module
-from .chroma import get_chroma_client, get_collection, CHROMA_DB_DIR
+from .chroma import get_chroma_client, get_collection, reset_database, get_qa_cache_collection, clear_qa_cache, CHROMA_DB_DIR
+from .file_index import add_chunks, get_chunk_ids, remove_files, list_files, clear_file_index, is_temp_filename, indexed_files, rebuild_file_index
@@ -16,6 +16,7 @@ Why ChromaDB?
 
 import chromadb
 from chromadb.config import Settings
+import functools
 import os
 
 # Define the persistence directory - where ChromaDB stores its data
@@ -25,13 +26,19 @@ CHROMA_DB_DIR = os.path.join(
     "chroma_db"
 )
 
+@functools.lru_cache(maxsize=1)
 def get_chroma_client():
     """
     Returns a persistent ChromaDB client.
     
     Persistent means: Data is saved to disk and survives program restarts.
     This is crucial for a production system.
+    
+    The client is created once per process and shared, so every caller
+    reuses the same SQLite connection and in-memory HNSW index cache.
     """
+    # Created here rather than at import so /documents/stats can still
+    # tell whether anything has been initialized yet
     os.makedirs(CHROMA_DB_DIR, exist_ok=True)
     return chromadb.PersistentClient(
         path=CHROMA_DB_DIR,
@@ -39,11 +46,14 @@ def get_chroma_client():
     )
 
 
+@functools.lru_cache(maxsize=8)
 def get_collection(name="rag_collection", embedding_function=None):
     """
     Returns a collection from the ChromaDB client.
     
     A collection is like a "table" in SQL - it holds related documents.
+    Handles are cached per (name, embedding_function); call
+    reset_database() rather than client.reset() so the cache is dropped too.
     
     Args:
         name: Collection name
@@ -56,6 +66,39 @@ def get_collection(name="rag_collection", embedding_function=None):
     )
 
 
+def reset_database():
+    """Delete every collection and forget cached collection handles."""
+    get_chroma_client().reset()
+    get_collection.cache_clear()
+
+
+# Collection holding cached question/answer pairs (see backend/agents/planner.py)
+QA_CACHE_COLLECTION = "qa_cache"
+
+
+def get_qa_cache_collection():
+    """
+    Returns the persistent answer-cache collection.
+    
+    Uses cosine distance so a lookup's distance is simply 1 - cosine similarity.
+    We pass question embeddings in directly, so no embedding function is needed.
+    """
+    client = get_chroma_client()
+    return client.get_or_create_collection(
+        name=QA_CACHE_COLLECTION,
+        metadata={"hnsw:space": "cosine"}
+    )
+
+
+def clear_qa_cache():
+    """Delete every cached answer (the collection is recreated on next use)."""
+    client = get_chroma_client()
+    try:
+        client.delete_collection(QA_CACHE_COLLECTION)
+    except Exception:
+        pass  # Collection doesn't exist yet
+
+
 if __name__ == "__main__":
     # Test connection
     try:
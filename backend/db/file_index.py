@@ -0,0 +1,215 @@
+"""
+File Index Module
+
+A small SQLite side index of which files (and which chunk ids) are in the
+vector database.
+
+Key Concept: Why a Side Index?
+-------------------------------
+ChromaDB stores metadata per chunk, not per file. Answering
+"which files have been uploaded?" or "which chunks belong to report.pdf?"
+from Chroma means scanning the metadata of EVERY chunk - O(N) work on each
+call to /documents, and it gets slower as the corpus grows.
+
+Instead we record files and their chunk ids when they are ingested:
+
+    files(filename PRIMARY KEY, is_temp)
+    chunks(id PRIMARY KEY, filename)   -- indexed by filename
+
+Listing documents is a single SELECT, and deleting a file is a lookup of
+its chunk ids followed by one collection.delete(ids=...).
+
+The index lives next to the Chroma data (CHROMA_DB_DIR/index.sqlite).
+ChromaDB stays the source of truth: the index is a cache of it. If it is
+missing or from an older schema it is rebuilt from the collection's
+metadata, and rebuild_file_index() does the same whenever a caller finds
+it disagreeing with Chroma.
+"""
+
+from typing import Iterable, List
+import logging
+import os
+import sqlite3
+import threading
+
+from backend.db.chroma import get_collection, CHROMA_DB_DIR
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_PATH = os.path.join(CHROMA_DB_DIR, "index.sqlite")
+
+# Bump when the schema changes; older index files are rebuilt from Chroma
+_SCHEMA_VERSION = 2
+
+_lock = threading.Lock()
+
+
+def is_temp_filename(filename: str) -> bool:
+    """
+    True for names left behind by old uploads that saved temp files
+    (e.g. tmp_xyz123.pdf, tmpabcdef123456789.pdf).
+    """
+    return filename.startswith('tmp') and ('_' in filename or len(filename) > 20)
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the index, creating (and back-filling) it on first use"""
+    os.makedirs(CHROMA_DB_DIR, exist_ok=True)
+    conn = sqlite3.connect(INDEX_PATH)
+
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != _SCHEMA_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS files")
+            conn.execute("DROP TABLE IF EXISTS chunks")
+            conn.execute(
+                "CREATE TABLE files ("
+                "filename TEXT PRIMARY KEY, "
+                "is_temp INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute(
+                "CREATE TABLE chunks ("
+                "id TEXT PRIMARY KEY, "
+                "filename TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX chunks_filename ON chunks (filename)")
+            _backfill(conn)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    return conn
+
+
+def _backfill(conn: sqlite3.Connection):
+    """One-time scan of the collection to index chunks ingested before the index existed"""
+    result = get_collection("rag_collection").get(include=["metadatas"])
+
+    ids, filenames = [], []
+    for chunk_id, meta in zip(result["ids"], result["metadatas"]):
+        if not meta:
+            continue
+        filename = meta.get("filename") or os.path.basename(meta.get("source", ""))
+        if filename:
+            ids.append(chunk_id)
+            filenames.append(filename)
+
+    _insert(conn, ids, filenames)
+    if ids:
+        logger.info("[OK] Indexed %d existing files (%d chunks)", len(set(filenames)), len(ids))
+
+
+def _insert(conn: sqlite3.Connection, ids: List[str], filenames: List[str]):
+    conn.executemany(
+        "INSERT OR IGNORE INTO files (filename, is_temp) VALUES (?, ?)",
+        [(name, int(is_temp_filename(name))) for name in set(filenames)]
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO chunks (id, filename) VALUES (?, ?)",
+        zip(ids, filenames)
+    )
+
+
+def add_chunks(ids: List[str], filenames: List[str]):
+    """Record newly ingested chunks (ids[i] belongs to filenames[i])"""
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                _insert(conn, ids, filenames)
+        finally:
+            conn.close()
+
+
+def get_chunk_ids(filenames: Iterable[str]) -> List[str]:
+    """Return the ids of every chunk belonging to the given files"""
+    filenames = list(filenames)
+    if not filenames:
+        return []
+
+    placeholders = ",".join("?" * len(filenames))
+    with _lock:
+        conn = _connect()
+        try:
+            rows = conn.execute(
+                f"SELECT id FROM chunks WHERE filename IN ({placeholders})",
+                filenames
+            ).fetchall()
+        finally:
+            conn.close()
+    return [row[0] for row in rows]
+
+
+def remove_files(filenames: Iterable[str]):
+    """Forget deleted files and their chunks"""
+    params = [(name,) for name in filenames]
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                conn.executemany("DELETE FROM chunks WHERE filename = ?", params)
+                conn.executemany("DELETE FROM files WHERE filename = ?", params)
+        finally:
+            conn.close()
+
+
+def indexed_files(filenames: Iterable[str]) -> set:
+    """Return which of the given filenames the index knows about"""
+    filenames = list(filenames)
+    if not filenames:
+        return set()
+
+    placeholders = ",".join("?" * len(filenames))
+    with _lock:
+        conn = _connect()
+        try:
+            rows = conn.execute(
+                f"SELECT filename FROM files WHERE filename IN ({placeholders})",
+                filenames
+            ).fetchall()
+        finally:
+            conn.close()
+    return {row[0] for row in rows}
+
+
+def rebuild_file_index():
+    """Re-derive the whole index from the collection (when it has drifted from Chroma)"""
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM chunks")
+                conn.execute("DELETE FROM files")
+                _backfill(conn)
+        finally:
+            conn.close()
+
+
+def list_files(temp: bool = False) -> List[str]:
+    """
+    Return indexed filenames, sorted.
+
+    Args:
+        temp: If True, return only temp-file entries instead of real documents
+    """
+    with _lock:
+        conn = _connect()
+        try:
+            rows = conn.execute(
+                "SELECT filename FROM files WHERE is_temp = ? ORDER BY filename",
+                (int(temp),)
+            ).fetchall()
+        finally:
+            conn.close()
+    return [row[0] for row in rows]
+
+
+def clear_file_index():
+    """Forget every file (call after the database is reset)"""
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM chunks")
+                conn.execute("DELETE FROM files")
+        finally:
+            conn.close()
@@ -3,3 +3,5 @@ from .pdf import load_pdf
 from .docx import load_docx
 from .ppt import load_ppt
 from .excel import load_excel
+from .txt import load_txt
+from .files import load_file, UnsupportedFileTypeError
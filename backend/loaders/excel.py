@@ -5,57 +5,128 @@ Extracts data from Excel spreadsheets.
 
 Challenge: Excel contains structured data (rows/columns), not prose.
 Solution: Convert each row into a readable text format.
+
+.xlsx files are streamed row by row with openpyxl in read-only mode, so
+memory stays flat no matter how big the sheet is - we never need a
+DataFrame just to turn rows into text. Legacy .xls files (which openpyxl
+can't read) go through pandas.
 """
 
+import importlib.util
+import os
+
+import openpyxl
 import pandas as pd
 from langchain_core.documents import Document
 from typing import List
 
+from backend.loaders.utils import FileSource, source_name
+
+
+# python-calamine (Rust) parses .xls much faster than xlrd when installed
+_XLS_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
 
-def load_excel(file_path: str) -> List[Document]:
+def load_excel(file_path: FileSource) -> List[Document]:
     """
     Load an Excel file and return a list of Documents.
-    
+
     Strategy:
     - Each row becomes a document
     - Format: "Column1: Value1 | Column2: Value2 | ..."
-    
+
     This allows the LLM to understand tabular data as text.
     """
     documents = []
-    
+    name = source_name(file_path)
+
+    try:
+        if os.path.splitext(name)[1].lower() == ".xls":
+            documents = _load_with_pandas(file_path)
+        else:
+            documents = _load_with_openpyxl(file_path)
+
+        print(f"   ✅ Extracted {len(documents)} rows total")
+
+    except Exception as e:
+        print(f"   ❌ Error loading Excel {name}: {e}")
+
+    return documents
+
+
+def _load_with_openpyxl(file_path: FileSource) -> List[Document]:
+    """Stream .xlsx rows without building a DataFrame"""
+    documents = []
+    name = source_name(file_path)
+
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
     try:
-        xls = pd.ExcelFile(file_path)
-        print(f"📊 Loading Excel: {file_path} ({len(xls.sheet_names)} sheets)")
-        
-        for sheet_name in xls.sheet_names:
-            df = pd.read_excel(xls, sheet_name=sheet_name)
-            print(f"   Sheet '{sheet_name}': {len(df)} rows")
-            
-            # Convert each row to text
-            for index, row in df.iterrows():
-                content_parts = []
-                
-                for col in df.columns:
-                    val = row[col]
-                    if pd.notna(val):  # Skip empty cells
-                        content_parts.append(f"{col}: {val}")
-                
-                content = " | ".join(content_parts)
-                
+        print(f"📊 Loading Excel: {name} ({len(wb.worksheets)} sheets)")
+
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                print(f"   Sheet '{ws.title}': 0 rows")
+                continue
+
+            # Name blank headers the way pandas does
+            columns = [
+                col if col is not None else f"Unnamed: {i}"
+                for i, col in enumerate(header)
+            ]
+
+            count = 0
+            # Row numbers start at 2 because Excel is 1-indexed and has header
+            for row_idx, row in enumerate(rows, start=2):
+                content = " | ".join(
+                    f"{col}: {val}"
+                    for col, val in zip(columns, row)
+                    if val is not None and val != ""  # Skip empty cells
+                )
                 if content:
                     documents.append(Document(
                         page_content=content,
-                        metadata={
-                            "source": file_path,
-                            "sheet": sheet_name,
-                            "row": int(index) + 2  # +2 because Excel is 1-indexed and has header
-                        }
+                        metadata={"source": name, "sheet": ws.title, "row": row_idx}
                     ))
-                    
-        print(f"   ✅ Extracted {len(documents)} rows total")
-        
-    except Exception as e:
-        print(f"   ❌ Error loading Excel {file_path}: {e}")
-        
+                    count += 1
+            print(f"   Sheet '{ws.title}': {count} rows")
+    finally:
+        wb.close()  # Read-only workbooks keep the file open until closed
+
+    return documents
+
+
+def _load_with_pandas(file_path: FileSource) -> List[Document]:
+    """Read legacy .xls sheets into DataFrames"""
+    documents = []
+    name = source_name(file_path)
+
+    xls = pd.ExcelFile(file_path, engine=_XLS_ENGINE)
+    print(f"📊 Loading Excel: {name} ({len(xls.sheet_names)} sheets)")
+
+    for sheet_name in xls.sheet_names:
+        df = pd.read_excel(xls, sheet_name=sheet_name)
+        print(f"   Sheet '{sheet_name}': {len(df)} rows")
+
+        # Convert each row to text, one column at a time.
+        # Vectorized string ops instead of df.iterrows(), which builds a
+        # Series object per row and is pandas' slowest iteration path.
+        mask = df.notna()
+        content = pd.Series("", index=df.index, dtype=object)
+        for col in df.columns:
+            cell = (f"{col}: " + df[col].astype(str)).where(mask[col], "")
+            sep = pd.Series(" | ", index=df.index).where(content.ne("") & mask[col], "")
+            content = content + sep + cell
+
+        # +2 because Excel is 1-indexed and has header
+        documents.extend(
+            Document(
+                page_content=text,
+                metadata={"source": name, "sheet": sheet_name, "row": row}
+            )
+            for text, row in zip(content, range(2, len(df) + 2))
+            if text
+        )
+
     return documents
@@ -0,0 +1,69 @@
+"""
+File Dispatch
+
+Picks the right loader for a file by its extension.
+
+This module deliberately imports nothing but the parsers: load_file runs
+in the upload worker processes (see backend/main.py), and each worker
+imports it on startup. Pulling in ChromaDB, the embedding model or the LLM
+clients there would cost hundreds of MB per worker for nothing.
+"""
+
+from langchain_core.documents import Document
+from typing import List, Optional
+import io
+import os
+
+from backend.loaders.pdf import load_pdf
+from backend.loaders.docx import load_docx
+from backend.loaders.ppt import load_ppt
+from backend.loaders.excel import load_excel
+from backend.loaders.txt import load_txt
+
+
+class UnsupportedFileTypeError(ValueError):
+    """Raised by load_file for extensions we have no loader for"""
+
+
+def load_file(file_path: str, content: Optional[bytes] = None) -> List[Document]:
+    """
+    Load a single file into Documents, picking the loader by extension.
+    
+    This is a plain top-level function so it can run in a worker process
+    (see the process pool in backend/main.py).
+    
+    Args:
+        file_path: Path to the file (or just its name, if content is given)
+        content: The file's bytes, to parse from memory instead of reading file_path
+    
+    Raises:
+        UnsupportedFileTypeError: if the extension isn't supported
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    
+    source = file_path
+    if content is not None:
+        source = io.BytesIO(content)
+        source.name = file_path  # Used by the loaders for logging
+    
+    if ext == ".pdf":
+        docs = load_pdf(source)
+    elif ext == ".docx":
+        docs = load_docx(source)
+    elif ext == ".pptx":
+        docs = load_ppt(source)
+    elif ext in [".xlsx", ".xls"]:
+        docs = load_excel(source)
+    elif ext == ".txt":
+        docs = load_txt(source)
+    else:
+        raise UnsupportedFileTypeError(f"Unsupported file type: {ext}")
+    
+    # Post-processing: Add clean filename to metadata for easier retrieval/deletion
+    clean_name = os.path.basename(file_path)
+    for doc in docs:
+        doc.metadata["filename"] = clean_name
+        # Also ensure source is readable if possible, but filename is key
+        doc.metadata["source"] = clean_name
+    
+    return docs
@@ -16,49 +16,225 @@ Why metadata matters:
 - Enables filtering by document/page
 """
 
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import shutil
+import subprocess
+
+import fitz  # PyMuPDF
 from pypdf import PdfReader
 from langchain_core.documents import Document
 from typing import List
 
+from backend.loaders.utils import FileSource, source_name
+
+
+# PDFs with at least this many pages are split across worker processes.
+# PyMuPDF isn't thread-safe (and holds the GIL), so processes are the only
+# way to use more than one core; below this the startup cost isn't worth it.
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "200"))
+
+# Minimum pages handed to each worker
+PAGES_PER_WORKER = 50
+
+# Path to poppler's pdftotext, if installed (set PDF_USE_PDFTOTEXT=false to skip it)
+PDFTOTEXT = (
+    shutil.which("pdftotext")
+    if os.getenv("PDF_USE_PDFTOTEXT", "true").lower() in ("1", "true", "yes")
+    else None
+)
+PDFTOTEXT_TIMEOUT = 120  # seconds
+
+# True inside the upload worker pool (see backend/main.py). Those workers
+# already parse one file each; a page pool per worker would multiply the
+# process count (PARSE_WORKERS x cpu_count interpreters).
+_in_worker_pool = False
+
 
-def load_pdf(file_path: str) -> List[Document]:
+def disable_page_parallelism():
+    """Process pool initializer: extract every PDF in the worker's own process"""
+    global _in_worker_pool
+    _in_worker_pool = True
+
+
+def load_pdf(file_path: FileSource) -> List[Document]:
     """
     Load a PDF file and return a list of Documents.
     
     Each page becomes a separate Document object.
     This allows fine-grained retrieval (e.g., "page 5 of contract.pdf")
     
+    Text is extracted with poppler's pdftotext binary when it is installed
+    (files on disk only), otherwise with PyMuPDF (C-backed MuPDF engine,
+    much faster than pure-Python parsers). If MuPDF can't parse the file
+    we fall back to pypdf.
+    
     Args:
-        file_path: Path to the PDF file
+        file_path: Path to the PDF file, or a binary file object
         
     Returns:
         List of Document objects with page_content and metadata
     """
     documents = []
+    name = source_name(file_path)
+    
+    if isinstance(file_path, str) and PDFTOTEXT:
+        try:
+            return _load_with_pdftotext(file_path)
+        except Exception as e:
+            print(f"   ⚠️  pdftotext failed on {name}: {e}")
     
     try:
-        reader = PdfReader(file_path)
-        print(f"📄 Loading PDF: {file_path} ({len(reader.pages)} pages)")
-        
-        for i, page in enumerate(reader.pages):
-            text = page.extract_text()
-            
-            if text and text.strip():  # Only add non-empty pages
-                documents.append(Document(
-                    page_content=text,
-                    metadata={
-                        "source": file_path,
-                        "page": i + 1,
-                        "total_pages": len(reader.pages)
-                    }
-                ))
-                
-        print(f"   ✅ Extracted {len(documents)} pages")
-        
+        documents = _load_with_pymupdf(file_path)
     except Exception as e:
-        print(f"   ❌ Error loading PDF {file_path}: {e}")
-        # Don't crash - just skip this file
+        print(f"   ⚠️  PyMuPDF failed on {name}: {e}")
+        print("   Falling back to pypdf...")
+        try:
+            if not isinstance(file_path, str):
+                file_path.seek(0)
+            documents = _load_with_pypdf(file_path)
+        except Exception as e:
+            print(f"   ❌ Error loading PDF {name}: {e}")
+            # Don't crash - just skip this file
+    
+    return documents
+
+
+def _load_with_pdftotext(file_path: str) -> List[Document]:
+    """Extract pages with the pdftotext binary (one subprocess for the whole file)"""
+    result = subprocess.run(
+        [PDFTOTEXT, "-enc", "UTF-8", file_path, "-"],
+        capture_output=True, check=True, timeout=PDFTOTEXT_TIMEOUT
+    )
+    
+    # pdftotext ends every page with a form feed
+    pages = result.stdout.decode("utf-8", errors="replace").split("\f")
+    if pages and not pages[-1].strip():
+        pages.pop()
+    total_pages = len(pages)
+    print(f"📄 Loading PDF: {file_path} ({total_pages} pages, pdftotext)")
+    
+    documents = [
+        Document(
+            page_content=text,
+            metadata={
+                "source": file_path,
+                "page": i + 1,
+                "total_pages": total_pages
+            }
+        )
+        for i, text in enumerate(pages)
+        if text.strip()  # Only add non-empty pages
+    ]
+    
+    print(f"   ✅ Extracted {len(documents)} pages")
+    return documents
+
+
+def _open_pdf(source):
+    """Open a PDF from a path or from bytes"""
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _extract_page_range(source, start: int, stop: int) -> List[str]:
+    """
+    Extract the text of pages [start, stop) - runs in a worker process.
+    
+    Each worker opens its own copy of the document: PyMuPDF objects
+    can't be shared between threads or processes.
+    """
+    doc = _open_pdf(source)
+    try:
+        return [doc.load_page(i).get_text("text") for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _page_workers(total_pages: int) -> int:
+    """How many processes to extract a document with (1 = don't parallelize)"""
+    if _in_worker_pool or total_pages < PARALLEL_MIN_PAGES:
+        return 1
+    return max(1, min(os.cpu_count() or 1, total_pages // PAGES_PER_WORKER))
+
+
+def _extract_pages_parallel(source, total_pages: int, workers: int) -> List[str]:
+    """Split the pages into contiguous ranges and extract them in worker processes"""
+    bounds = [total_pages * w // workers for w in range(workers + 1)]
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        chunks = pool.map(
+            _extract_page_range,
+            [source] * workers, bounds[:-1], bounds[1:]
+        )
+        return [text for chunk in chunks for text in chunk]
+
+
+def _load_with_pymupdf(file_path: FileSource) -> List[Document]:
+    """Extract pages with PyMuPDF"""
+    name = source_name(file_path)
+    
+    source = file_path if isinstance(file_path, str) else file_path.read()
+    doc = _open_pdf(source)
+    try:
+        total_pages = len(doc)
+        print(f"📄 Loading PDF: {name} ({total_pages} pages)")
+        
+        workers = _page_workers(total_pages)
+        if workers == 1:
+            texts = [page.get_text("text") for page in doc]
+    finally:
+        doc.close()
+    
+    if workers > 1:
+        texts = _extract_pages_parallel(source, total_pages, workers)
+    
+    documents = [
+        Document(
+            page_content=text,
+            metadata={
+                "source": name,
+                "page": i + 1,
+                "total_pages": total_pages
+            }
+        )
+        for i, text in enumerate(texts)
+        if text and text.strip()  # Only add non-empty pages
+    ]
+    
+    print(f"   ✅ Extracted {len(documents)} pages")
+    return documents
+
+
+def _load_with_pypdf(file_path: FileSource) -> List[Document]:
+    """Extract pages with pypdf (slower, but tolerant of some files MuPDF rejects)"""
+    documents = []
+    name = source_name(file_path)
+    
+    reader = PdfReader(file_path)
+    pages = reader.pages
+    total_pages = len(pages)  # Count once; len() re-walks the page tree
+    print(f"📄 Loading PDF: {name} ({total_pages} pages)")
+    
+    for i, page in enumerate(pages):
+        text = page.extract_text()
         
+        if text and text.strip():  # Only add non-empty pages
+            documents.append(Document(
+                page_content=text,
+                metadata={
+                    "source": name,
+                    "page": i + 1,
+                    "total_pages": total_pages
+                }
+            ))
+            
+    print(f"   ✅ Extracted {len(documents)} pages")
     return documents
 
 
@@ -8,46 +8,46 @@ from pptx import Presentation
 from langchain_core.documents import Document
 from typing import List
 
+from backend.loaders.utils import FileSource, source_name
 
-def load_ppt(file_path: str) -> List[Document]:
+
+def load_ppt(file_path: FileSource) -> List[Document]:
     """
     Load a PPTX file and return a list of Documents (one per slide).
     
     Each slide becomes a separate document for granular retrieval.
     """
     documents = []
+    name = source_name(file_path)
     
     try:
         prs = Presentation(file_path)
-        print(f"📊 Loading PPTX: {file_path} ({len(prs.slides)} slides)")
+        total_slides = len(prs.slides)
+        print(f"📊 Loading PPTX: {name} ({total_slides} slides)")
         
         for i, slide in enumerate(prs.slides):
-            text_runs = []
-            
-            # Extract text from all shapes in the slide
-            for shape in slide.shapes:
-                if not shape.has_text_frame:
-                    continue
-                for paragraph in shape.text_frame.paragraphs:
-                    for run in paragraph.runs:
-                        if run.text.strip():
-                            text_runs.append(run.text)
-            
-            text = "\n".join(text_runs).strip()
+            # Extract text from all shapes in the slide.
+            # text_frame.text joins paragraphs (and their runs) in one
+            # property call instead of visiting every run from Python.
+            shape_texts = [
+                shape.text_frame.text
+                for shape in slide.shapes if shape.has_text_frame
+            ]
+            text = "\n".join(t for t in shape_texts if t.strip()).strip()
             
             if text:
                 documents.append(Document(
                     page_content=text,
                     metadata={
-                        "source": file_path,
+                        "source": name,
                         "slide": i + 1,
-                        "total_slides": len(prs.slides)
+                        "total_slides": total_slides
                     }
                 ))
                 
         print(f"   ✅ Extracted {len(documents)} slides")
         
     except Exception as e:
-        print(f"   ❌ Error loading PPTX {file_path}: {e}")
+        print(f"   ❌ Error loading PPTX {name}: {e}")
         
     return documents
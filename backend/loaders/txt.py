@@ -0,0 +1,84 @@
+"""
+Text Loader Module
+
+Loads plain UTF-8 text files.
+
+Large files (e.g. multi-GB logs) are read in 1MB blocks rather than all at
+once, and each block becomes its own Document, cut at the last paragraph
+or line break (a space, for a single enormous line) so words are never
+split between two Documents.
+"""
+
+from langchain_core.documents import Document
+from typing import Iterator, List
+import codecs
+
+from backend.loaders.utils import FileSource, source_name
+
+
+# Bytes read (and roughly characters per Document) at a time
+BLOCK_SIZE = 1024 * 1024
+
+
+def load_txt(source: FileSource) -> List[Document]:
+    """
+    Load a text file and return its Documents (none if it's blank).
+
+    Args:
+        source: Path to the file, or a binary file object
+    """
+    name = source_name(source)
+
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            blocks = list(_read_blocks(f))
+    else:
+        blocks = list(_read_blocks(source))
+
+    documents = [
+        Document(page_content=block, metadata={"source": name})
+        for block in blocks
+        if block.strip()
+    ]
+    if documents:
+        print(f"[LOADED] TXT: {name} ({len(documents)} blocks)")
+    return documents
+
+
+def _read_blocks(f) -> Iterator[str]:
+    """
+    Decode a binary file into text blocks of about BLOCK_SIZE characters.
+
+    The incremental decoder keeps multi-byte characters that straddle a
+    read boundary intact; the text after a block's last break is carried
+    over to the next block.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    carry = ""
+
+    # Read one block ahead so the final block is never cut: only text that
+    # more data follows needs to end at a break
+    data = f.read(BLOCK_SIZE)
+    while data:
+        next_data = f.read(BLOCK_SIZE)
+        text = carry + decoder.decode(data, final=not next_data)
+        if not next_data:
+            yield text
+            return
+
+        cut = _last_break(text)
+        if cut == -1:
+            carry = text  # No break at all yet: keep reading
+        else:
+            yield text[:cut]
+            carry = text[cut:]
+        data = next_data
+
+
+def _last_break(text: str) -> int:
+    """Index just past the last paragraph break, else line break, else space, else -1"""
+    for sep in ("\n\n", "\n", " "):
+        i = text.rfind(sep)
+        if i != -1:
+            return i + len(sep)
+    return -1
@@ -0,0 +1,19 @@
+"""
+Loader Helpers
+
+Shared by the loaders, which accept either a file path or an in-memory
+binary file (e.g. io.BytesIO of an upload that was never written to disk).
+"""
+
+from typing import BinaryIO, Union
+
+
+# A path on disk, or a binary file object positioned at the start
+FileSource = Union[str, BinaryIO]
+
+
+def source_name(source: FileSource) -> str:
+    """Display name for a source: the path, or the file object's .name if it has one"""
+    if isinstance(source, str):
+        return source
+    return getattr(source, "name", "<in-memory file>")
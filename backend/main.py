@@ -13,29 +13,84 @@ Endpoints:
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
+from contextlib import asynccontextmanager
 import os
+import logging
 import tempfile
 import asyncio
-import json
+import aiofiles
+import orjson
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from backend.rag.ingest import ingest_files
-from backend.agents.planner import ask_question
-from backend.db.chroma import get_chroma_client, CHROMA_DB_DIR
+from backend.rag.ingest import ingest_documents, invalidate_caches
+from backend.loaders.files import load_file
+from backend.loaders.pdf import disable_page_parallelism
+from backend.agents.planner import ask_question, warmup, close_async_clients
+from backend.db.chroma import get_collection, reset_database, CHROMA_DB_DIR
+from backend.db.file_index import (
+    list_files, get_chunk_ids, remove_files, clear_file_index,
+    indexed_files, rebuild_file_index
+)
+
+# Backend modules log through the logging module (per-query search
+# diagnostics are DEBUG, so they cost nothing at the default INFO level)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
+
+logger = logging.getLogger(__name__)
 
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+# Search + LLM calls are blocking, so chat handlers run them in worker
+# threads. The semaphore caps how many LLM round-trips run at once.
+MAX_CONCURRENT_LLM_CALLS = int(os.getenv("MAX_CONCURRENT_LLM_CALLS", "8"))
+llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+
+# Worker processes for parsing uploads. Each one holds its own copy of the
+# parser libraries, so don't start one per core on a large machine.
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(os.cpu_count() or 1, 4))))
+
+# Seconds between SSE keep-alive comments while the answer is generating
+HEARTBEAT_INTERVAL = 10
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up heavy clients at startup and close them at shutdown"""
+    # Document parsing is CPU-bound Python, so uploads parse files in
+    # parallel worker processes. "spawn" avoids forking a process that
+    # already has torch/ChromaDB threads running.
+    app.state.process_pool = ProcessPoolExecutor(
+        max_workers=PARSE_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        # Workers are already one-per-file; no nested page pools inside them
+        initializer=disable_page_parallelism
+    )
+
+    # Open ChromaDB, load the embedding model and build the LLM client now,
+    # so the first user request doesn't pay for it
+    await asyncio.to_thread(warmup)
+
+    # Shared handle for the document management endpoints
+    app.state.collection = get_collection("rag_collection")
+    yield
+    await close_async_clients()
+    app.state.process_pool.shutdown(cancel_futures=True)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Agentic RAG System",
     description="AI-powered document Q&A system with agentic reasoning",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # orjson serializes much faster than stdlib json
 )
 
 # Add rate limiter to app
@@ -112,29 +167,17 @@ async def upload_files(request: Request, files: List[UploadFile] = File(...)):
     
     # File size limit: 10MB per file
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+    UPLOAD_CHUNK_SIZE = 64 * 1024  # Copy uploads to disk 64KB at a time
+    # Uploads up to this size are parsed straight from memory. Starlette
+    # already spools them in RAM (up to 1MB), so writing them to a temp
+    # file just to read them back is wasted I/O.
+    IN_MEMORY_UPLOAD_SIZE = 1024 * 1024
     
+    uploads = []  # (filename, temp file path or None, bytes or None)
     temp_files = []
     
     try:
-        # Save uploaded files temporarily
         for file in files:
-            # Check file size
-            file.file.seek(0, 2)  # Seek to end
-            file_size = file.file.tell()
-            file.file.seek(0)  # Reset to beginning
-            
-            if file_size > MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"File '{file.filename}' is too large ({file_size / 1024 / 1024:.1f}MB). Maximum size is 10MB."
-                )
-            
-            if file_size == 0:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"File '{file.filename}' is empty."
-                )
-            
             # Validate file extension
             ext = os.path.splitext(file.filename)[1].lower()
             if ext not in ['.pdf', '.docx', '.pptx', '.xlsx', '.xls', '.txt']:
@@ -143,38 +186,66 @@ async def upload_files(request: Request, files: List[UploadFile] = File(...)):
                     detail=f"Unsupported file type: {ext}. Supported: PDF, DOCX, PPTX, XLSX, TXT"
                 )
             
-            # Create a user-specific temp directory for this upload
-            upload_dir = tempfile.mkdtemp()
-            temp_files.append(upload_dir) # Keep track to clean up later
-            
-            # Save file with ORIGINAL filename
             clean_filename = os.path.basename(file.filename)
-            file_path = os.path.join(upload_dir, clean_filename)
             
-            with open(file_path, "wb") as f:
+            if file.size is not None and file.size <= IN_MEMORY_UPLOAD_SIZE:
                 content = await file.read()
-                f.write(content)
+                file_size = len(content)
+                file_path = None
+            else:
+                content = None
+                
+                # Create a user-specific temp directory for this upload
+                upload_dir = tempfile.mkdtemp()
+                temp_files.append(upload_dir) # Keep track to clean up later
+                
+                # Save file with ORIGINAL filename
+                file_path = os.path.join(upload_dir, clean_filename)
+                temp_files.append(file_path)
+                
+                # Stream to disk in 64KB chunks instead of buffering the whole
+                # upload in memory, counting the size as we go
+                file_size = 0
+                async with aiofiles.open(file_path, "wb") as f:
+                    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                        file_size += len(chunk)
+                        if file_size > MAX_FILE_SIZE:
+                            raise HTTPException(
+                                status_code=413,
+                                detail=f"File '{file.filename}' is too large. Maximum size is 10MB."
+                            )
+                        await f.write(chunk)
             
-            temp_files.append(file_path) # Add to list for ingestion
-        
-        # Filter out directories from the ingestion list (we only ingest files)
-        files_to_ingest = [f for f in temp_files if os.path.isfile(f)]
-        directories_to_clean = [f for f in temp_files if os.path.isdir(f)]
+            if file_size == 0:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File '{file.filename}' is empty."
+                )
+            
+            uploads.append((clean_filename, file_path, content))
 
         # Check for duplicate files
         try:
-            client = get_chroma_client()
-            collection = client.get_or_create_collection("rag_collection")
-            result = collection.get(include=['metadatas'])
-            existing_files = set()
-            for meta in result['metadatas']:
-                if meta and 'filename' in meta:
-                    existing_files.add(meta['filename'])
+            collection = request.app.state.collection
+            new_filenames = [filename for filename, _, _ in uploads]
+            
+            # Only fetch chunks of the files being uploaded, not the whole collection
+            result = collection.get(
+                where={"filename": {"$in": new_filenames}},
+                include=['metadatas']
+            )
+            existing_files = {meta['filename'] for meta in result['metadatas'] if meta}
             
             # Filter out duplicates
-            new_filenames = [os.path.basename(f) for f in files_to_ingest]
             duplicates = [fn for fn in new_filenames if fn in existing_files]
             
+            # Chroma is authoritative. If it has a file the index doesn't
+            # list (e.g. a failed index write), rebuild the index so the
+            # file shows up in /documents and can be deleted.
+            if duplicates and set(duplicates) - indexed_files(duplicates):
+                logger.warning("[WARN] File index out of sync with ChromaDB; rebuilding it")
+                await asyncio.to_thread(rebuild_file_index)
+            
             if duplicates:
                 raise HTTPException(
                     status_code=409,
@@ -186,8 +257,26 @@ async def upload_files(request: Request, files: List[UploadFile] = File(...)):
             # If check fails, continue anyway (better than blocking upload)
             print(f"[WARN] Could not check for duplicates: {e}")
 
-        # Ingest files
-        stats = ingest_files(files_to_ingest)
+        # Parse files in parallel worker processes, then embed + store here
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[loop.run_in_executor(
+                request.app.state.process_pool, load_file, file_path or filename, content
+              ) for filename, file_path, content in uploads],
+            return_exceptions=True
+        )
+        document_batches = [r for r in results if not isinstance(r, BaseException)]
+        for (filename, _, _), r in zip(uploads, results):
+            if isinstance(r, BaseException):
+                print(f"[ERROR] Failed to load {filename}: {r}")
+
+        # Embedding and the Chroma writes are blocking; run them in a worker
+        # thread so other requests (and SSE heartbeats) keep being served
+        stats = await asyncio.to_thread(
+            ingest_documents,
+            document_batches,
+            files_failed=len(results) - len(document_batches)
+        )
         
         return {
             "status": "success",
@@ -195,6 +284,8 @@ async def upload_files(request: Request, files: List[UploadFile] = File(...)):
             "stats": stats
         }
     
+    except HTTPException:
+        raise  # Keep 400/409/413 instead of turning them into a 500
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
     
@@ -235,12 +326,14 @@ async def chat(request: Request, chat_data: ChatRequest):
         )
     
     try:
-        # Get answer from agent
-        result = ask_question(
-            chat_data.question,
-            verbose=False,
-            provider=chat_data.provider
-        )
+        # Get answer from agent (in a thread, so other requests keep being served)
+        async with llm_semaphore:
+            result = await asyncio.to_thread(
+                ask_question,
+                chat_data.question,
+                verbose=False,
+                provider=chat_data.provider
+            )
         
         return ChatResponse(
             answer=result['output'],
@@ -252,6 +345,11 @@ async def chat(request: Request, chat_data: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Failed to generate answer: {str(e)}")
 
 
+def sse(event: dict) -> bytes:
+    """Encode one Server-Sent Event frame (compact JSON, sent as bytes)"""
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
+
 # Streaming chat endpoint
 @app.post("/chat/stream")
 @limiter.limit("20/minute")  # Max 20 streaming requests per minute
@@ -279,17 +377,19 @@ async def chat_stream(request: Request, chat_data: ChatRequest):
     async def generate():
         try:
             # Step 1: Send thinking status
-            yield f"data: {json.dumps({'type': 'thinking', 'message': 'Searching documents...'})}\n\n"
+            yield sse({'type': 'thinking', 'message': 'Searching documents...'})
 
             # Import here to avoid circular imports
             from backend.rag.search import search_documents
 
             # Search for relevant documents
-            search_results = search_documents(chat_data.question, n_results=5)
+            search_results = await asyncio.to_thread(
+                search_documents, chat_data.question, n_results=5
+            )
 
             if not search_results:
-                yield f"data: {json.dumps({'type': 'answer', 'content': 'I could not find any relevant information in the documents.'})}\n\n"
-                yield f"data: {json.dumps({'type': 'done'})}\n\n"
+                yield sse({'type': 'answer', 'content': 'I could not find any relevant information in the documents.'})
+                yield sse({'type': 'done'})
                 return
 
             # Step 2: Send sources
@@ -302,25 +402,34 @@ async def chat_stream(request: Request, chat_data: ChatRequest):
                     citation += f" (Page {page})"
                 sources.append(citation)
 
-            yield f"data: {json.dumps({'type': 'sources', 'sources': sources})}\n\n"
+            yield sse({'type': 'sources', 'sources': sources})
 
             # Step 3: Generate answer
-            yield f"data: {json.dumps({'type': 'thinking', 'message': 'Generating answer...'})}\n\n"
-
-            result = ask_question(
-                chat_data.question,
-                verbose=False,
-                provider=chat_data.provider
-            )
+            yield sse({'type': 'thinking', 'message': 'Generating answer...'})
+
+            async with llm_semaphore:
+                task = asyncio.ensure_future(asyncio.to_thread(
+                    ask_question,
+                    chat_data.question,
+                    verbose=False,
+                    provider=chat_data.provider,
+                    prefetched_context=search_results  # Don't search twice
+                ))
+                # Send SSE comments while waiting so proxies don't drop the connection
+                while not task.done():
+                    done, _ = await asyncio.wait({task}, timeout=HEARTBEAT_INTERVAL)
+                    if not done:
+                        yield b": keep-alive\n\n"
+                result = task.result()
 
             # Step 4: Send answer
-            yield f"data: {json.dumps({'type': 'answer', 'content': result['output']})}\n\n"
+            yield sse({'type': 'answer', 'content': result['output']})
 
             # Step 5: Done
-            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+            yield sse({'type': 'done'})
 
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield sse({'type': 'error', 'message': str(e)})
 
     return StreamingResponse(
         generate(),
@@ -334,7 +443,7 @@ async def chat_stream(request: Request, chat_data: ChatRequest):
 
 # Document statistics endpoint
 @app.get("/documents/stats")
-async def get_document_stats():
+async def get_document_stats(request: Request):
     """
     Get statistics about the indexed documents.
 
@@ -351,8 +460,7 @@ async def get_document_stats():
                 "message": "No documents have been ingested yet"
             }
 
-        client = get_chroma_client()
-        collection = client.get_or_create_collection("rag_collection")
+        collection = request.app.state.collection
         count = collection.count()
 
         return {
@@ -376,32 +484,9 @@ async def list_documents():
         if not os.path.exists(CHROMA_DB_DIR):
             return {"documents": []}
 
-        client = get_chroma_client()
-        collection = client.get_or_create_collection("rag_collection")
-
-        # Get all metadata
-        result = collection.get(include=['metadatas'])
-        metadatas = result['metadatas']
-
-        # Extract unique filenames - filter out temp file patterns
-        unique_files = set()
-        for meta in metadatas:
-            if not meta:
-                continue
-
-            filename = None
-            if 'filename' in meta:
-                filename = meta['filename']
-            elif 'source' in meta:
-                filename = os.path.basename(meta['source'])
-
-            if filename:
-                # Skip temp file patterns (e.g., tmp_xyz123.pdf, tmpabcdef.pdf)
-                if filename.startswith('tmp') and ('_' in filename or len(filename) > 20):
-                    continue
-                unique_files.add(filename)
-
-        return {"documents": sorted(list(unique_files))}
+        # Read from the file index instead of scanning every chunk's metadata
+        # (temp-file entries are excluded; see /documents/cleanup)
+        return {"documents": list_files()}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list documents: {str(e)}")
@@ -409,40 +494,34 @@ async def list_documents():
 
 # Delete document endpoint
 @app.delete("/documents/{filename}")
-async def delete_document(filename: str):
+async def delete_document(request: Request, filename: str):
     """
     Delete a specific document by filename.
     Removes all chunks associated with the document from the vector database.
     """
     try:
-        client = get_chroma_client()
-        collection = client.get_or_create_collection("rag_collection")
-
-        # Get all documents with their IDs and metadata
-        result = collection.get(include=['metadatas'])
-        ids = result['ids']
-        metadatas = result['metadatas']
-
-        # Find IDs that match the filename
-        ids_to_delete = []
-        for doc_id, meta in zip(ids, metadatas):
-            if not meta:
-                continue
-
-            # Check both 'filename' and 'source' fields
-            doc_filename = meta.get('filename', '')
-            doc_source = os.path.basename(meta.get('source', ''))
-
-            if filename == doc_filename or filename == doc_source:
-                ids_to_delete.append(doc_id)
-
-        if ids_to_delete:
-            collection.delete(ids=ids_to_delete)
+        collection = request.app.state.collection
+
+        # Count the chunks from the file index (no scan of the collection);
+        # only ask Chroma if the index has none, in case it missed some
+        chunk_count = len(get_chunk_ids([filename]))
+        if not chunk_count:
+            chunk_count = len(collection.get(where={"filename": filename}, include=[])["ids"])
+
+        if chunk_count:
+            # Delete by metadata filter: Chroma decides what belongs to the
+            # file, so chunks the index doesn't know about go too
+            collection.delete(where={"filename": filename})
+            invalidate_caches()
+            # Only forget the file once its chunks are really gone, so a
+            # failed delete can be retried
+            remove_files([filename])
             return {
                 "status": "success",
-                "message": f"Deleted {filename} ({len(ids_to_delete)} chunks removed)"
+                "message": f"Deleted {filename} ({chunk_count} chunks removed)"
             }
         else:
+            remove_files([filename])
             return {
                 "status": "warning",
                 "message": f"No chunks found for {filename}"
@@ -455,37 +534,26 @@ async def delete_document(filename: str):
 
 # Cleanup temp files from database
 @app.post("/documents/cleanup")
-async def cleanup_temp_documents():
+async def cleanup_temp_documents(request: Request):
     """
     Remove old temporary file entries from the database.
     This cleans up entries with temp file patterns like tmp_xyz.pdf
     """
     try:
-        client = get_chroma_client()
-        collection = client.get_or_create_collection("rag_collection")
-
-        # Get all documents
-        result = collection.get(include=['metadatas'])
-        ids = result['ids']
-        metadatas = result['metadatas']
-
-        # Find IDs with temp file patterns
-        ids_to_delete = []
-        for doc_id, meta in zip(ids, metadatas):
-            if not meta:
-                continue
-
-            filename = meta.get('filename', '') or os.path.basename(meta.get('source', ''))
+        collection = request.app.state.collection
 
-            # Match temp file patterns
-            if filename.startswith('tmp') and ('_' in filename or len(filename) > 20):
-                ids_to_delete.append(doc_id)
+        # Temp files are flagged in the file index; their chunks are deleted
+        # by metadata filter (see delete_document)
+        temp_names = list_files(temp=True)
+        chunk_count = len(get_chunk_ids(temp_names))
 
-        if ids_to_delete:
-            collection.delete(ids=ids_to_delete)
+        if temp_names:
+            collection.delete(where={"filename": {"$in": temp_names}})
+            invalidate_caches()
+            remove_files(temp_names)  # After the delete succeeded (see delete_document)
             return {
                 "status": "success",
-                "message": f"Cleaned up {len(ids_to_delete)} temporary file entries"
+                "message": f"Cleaned up {chunk_count} temporary file entries"
             }
         else:
             return {
@@ -499,14 +567,17 @@ async def cleanup_temp_documents():
 
 # Clear database endpoint
 @app.delete("/clear")
-async def clear_database():
+async def clear_database(request: Request):
     """
     Clear the vector database (for testing purposes).
     WARNING: This will delete all ingested documents!
     """
     try:
-        client = get_chroma_client()
-        client.reset()
+        reset_database()
+        # The old collection handle points at a deleted collection
+        request.app.state.collection = get_collection("rag_collection")
+        clear_file_index()
+        invalidate_caches()
         
         return {
             "status": "success",
@@ -11,10 +11,11 @@ This server exposes:
 - search_internal_docs: Search the document database
 """
 
-import json
 import sys
 from typing import Any, Dict, List
 
+import orjson
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(__file__).rsplit("backend", 1)[0])
 
@@ -45,6 +46,26 @@ TOOLS = [
 ]
 
 
+# Result of "initialize" (static, so it's also pre-encoded below)
+SERVER_INFO = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "agentic-rag-mcp",
+        "version": "1.0.0"
+    }
+}
+
+# Responses to these methods never change except for the request id,
+# so their "result" JSON is serialized once at import
+_STATIC_RESULTS = {
+    "initialize": orjson.dumps(SERVER_INFO),
+    "tools/list": orjson.dumps({"tools": TOOLS}),
+}
+
+
 def handle_search_internal_docs(arguments: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handle the search_internal_docs tool call.
@@ -119,16 +140,7 @@ def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "jsonrpc": "2.0",
             "id": request_id,
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {}
-                },
-                "serverInfo": {
-                    "name": "agentic-rag-mcp",
-                    "version": "1.0.0"
-                }
-            }
+            "result": SERVER_INFO
         }
 
     elif method == "tools/list":
@@ -177,42 +189,58 @@ def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+def encode_response(request: Dict[str, Any]) -> bytes:
+    """
+    Handle a request and return the serialized response ("" for notifications).
+
+    initialize and tools/list splice the request id into their pre-encoded
+    result instead of serializing the same payload again.
+    """
+    static_result = _STATIC_RESULTS.get(request.get("method", ""))
+    if static_result is not None:
+        return (
+            b'{"jsonrpc":"2.0","id":' + orjson.dumps(request.get("id"))
+            + b',"result":' + static_result + b'}'
+        )
+
+    response = handle_request(request)
+    return orjson.dumps(response) if response is not None else b""
+
+
+def _error_response(code: int, message: str) -> bytes:
+    return orjson.dumps({
+        "jsonrpc": "2.0",
+        "id": None,
+        "error": {
+            "code": code,
+            "message": message
+        }
+    })
+
+
 def run_stdio_server():
     """
     Run the MCP server using stdio transport.
 
     This allows the server to be used with Claude Desktop, Cursor, etc.
+    Messages are read and written as raw bytes (orjson parses UTF-8
+    directly, so there is no decode/encode step).
     """
     print("Agentic RAG MCP Server started (stdio mode)", file=sys.stderr)
 
-    for line in sys.stdin:
-        try:
-            request = json.loads(line.strip())
-            response = handle_request(request)
-
-            if response is not None:
-                print(json.dumps(response), flush=True)
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
 
-        except json.JSONDecodeError as e:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": None,
-                "error": {
-                    "code": -32700,
-                    "message": f"Parse error: {str(e)}"
-                }
-            }
-            print(json.dumps(error_response), flush=True)
+    while line := stdin.readline():
+        try:
+            payload = encode_response(orjson.loads(line))
+        except orjson.JSONDecodeError as e:
+            payload = _error_response(-32700, f"Parse error: {str(e)}")
         except Exception as e:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": None,
-                "error": {
-                    "code": -32603,
-                    "message": f"Internal error: {str(e)}"
-                }
-            }
-            print(json.dumps(error_response), flush=True)
+            payload = _error_response(-32603, f"Internal error: {str(e)}")
+
+        if payload:
+            stdout.write(payload + b"\n")
+            stdout.flush()
 
 
 if __name__ == "__main__":
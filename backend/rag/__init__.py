@@ -1,4 +1,5 @@
 # RAG module
-from .ingest import ingest_files
-from .search import search_documents, search_with_scores
+from .ingest import ingest_files, ingest_documents, load_file, invalidate_caches
+from .search import search_documents, search_with_scores, embed_query
 from .embed import get_embeddings
+from .semantic_cache import SemanticCache, answer_cache
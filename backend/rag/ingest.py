@@ -24,21 +24,50 @@ Chunk 2: "...The CEO is John Smith. He has 20 years of experience..."
 """
 
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List
-import os
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_chroma import Chroma
+import hashlib
+import logging
+import queue
+import threading
 from langchain_core.documents import Document
 
 
 from backend.rag.embed import get_embeddings
-from backend.db.chroma import get_chroma_client, CHROMA_DB_DIR
+from backend.rag.splitter import split_documents
+from backend.rag.semantic_cache import answer_cache
+from backend.rag.search import reset_vector_store, clear_search_cache
+from backend.rag.rag_cache import clear_rag_cache
+from backend.rag.vector_index import USE_QUANT_INDEX, build_quant_index
+from backend.db.chroma import get_collection, clear_qa_cache, CHROMA_DB_DIR
+from backend.db.file_index import add_chunks
 
-# Import all loaders
-from backend.loaders.pdf import load_pdf
-from backend.loaders.docx import load_docx
-from backend.loaders.ppt import load_ppt
-from backend.loaders.excel import load_excel
+# Picks the loader for each file by extension
+from backend.loaders.files import load_file, UnsupportedFileTypeError
+
+
+logger = logging.getLogger(__name__)
+
+
+# Chunks embedded and written to Chroma per batch
+INGEST_BATCH_SIZE = 256
+
+# Embedded batches allowed to wait for the writer thread
+WRITE_QUEUE_SIZE = 4
+
+
+def invalidate_caches():
+    """
+    Drop cached answers, cached search results, the in-memory RAG cache
+    and the search module's collection handle after the document set changes.
+    
+    Call this after anything is added to or removed from the vector database.
+    """
+    answer_cache.clear()
+    clear_qa_cache()
+    reset_vector_store()
+    clear_rag_cache()
+    clear_search_cache()
 
 
 def ingest_files(file_paths: List[str]) -> dict:
@@ -48,110 +77,178 @@ def ingest_files(file_paths: List[str]) -> dict:
     Returns:
         dict with statistics about the ingestion
     """
-    documents = []
-    stats = {
-        "files_processed": 0,
-        "files_failed": 0,
-        "total_chunks": 0,
-        "total_documents": 0
-    }
+    document_batches = []
+    files_failed = 0
     
     # Step 1: Load all documents
-    print("\n" + "="*60)
-    print("STEP 1: LOADING DOCUMENTS")
-    print("="*60)
+    logger.info("STEP 1: LOADING DOCUMENTS")
     
-    for file_path in file_paths:
-        ext = os.path.splitext(file_path)[1].lower()
+    # Load files concurrently: PDF extraction (MuPDF, pdftotext) and file
+    # reads spend much of their time outside the GIL
+    with ThreadPoolExecutor(max_workers=min(32, len(file_paths) or 1)) as pool:
+        futures = {pool.submit(load_file, file_path): file_path for file_path in file_paths}
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                document_batches.append(future.result())
+            except UnsupportedFileTypeError as e:
+                logger.warning("[WARN] Skipping %s: %s", file_path, e)
+            except Exception as e:
+                logger.error("[ERROR] Failed to load %s: %s", file_path, e)
+                files_failed += 1
+
+    return ingest_documents(document_batches, files_failed=files_failed)
+
+
+def _chunk_id(doc: Document) -> str:
+    """Deterministic chunk id: hash of the source file name and the chunk text"""
+    key = doc.metadata.get("filename", "") + "\0" + doc.page_content
+    # BLAKE2b is faster than SHA-1/SHA-256 in CPython; 16 bytes is plenty
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _write_batches(collection, write_queue: queue.Queue, stats: dict, errors: list):
+    """
+    Writer thread for ingest_documents: store embedded batches until None.
+    
+    The first exception is recorded in errors; later batches are then
+    drained without being written.
+    """
+    while True:
+        item = write_queue.get()
+        if item is None:
+            return
+        if errors:
+            continue
         
+        n, num_batches, batch, embeddings = item
         try:
-            if ext == ".pdf":
-                docs = load_pdf(file_path)
-            elif ext == ".docx":
-                docs = load_docx(file_path)
-            elif ext == ".pptx":
-                docs = load_ppt(file_path)
-            elif ext in [".xlsx", ".xls"]:
-                docs = load_excel(file_path)
-            elif ext == ".txt":
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    if content.strip():
-                        docs = [Document(
-                            page_content=content,
-                            metadata={"source": file_path}
-                        )]
-                        print(f"[LOADED] TXT: {file_path}")
-                    else:
-                        docs = []
-            else:
-                print(f"[WARN] Skipping unsupported file type: {ext}")
-                continue
-            
-            documents.extend(docs)
-            stats["files_processed"] += 1
-            stats["total_documents"] += len(docs)
-            
-            # Post-processing: Add clean filename to metadata for easier retrieval/deletion
-            clean_name = os.path.basename(file_path)
-            for doc in docs:
-                doc.metadata["filename"] = clean_name
-                # Also ensure source is readable if possible, but filename is key
-                doc.metadata["source"] = clean_name
+            ids = [chunk_id for chunk_id, _ in batch]
+            collection.add(
+                ids=ids,
+                embeddings=embeddings,
+                documents=[doc.page_content for _, doc in batch],
+                metadatas=[doc.metadata for _, doc in batch]
+            )
             
+            # Record chunk ids per file in the side index used by /documents
+            add_chunks(ids, [doc.metadata.get("filename", "") for _, doc in batch])
+            stats["total_chunks"] += len(batch)
+            logger.info("   Batch %d/%d: %d chunks", n, num_batches, len(batch))
         except Exception as e:
-            print(f"[ERROR] Failed to load {file_path}: {e}")
-            stats["files_failed"] += 1
+            errors.append(e)
+
+
+def ingest_documents(document_batches: List[List[Document]], files_failed: int = 0) -> dict:
+    """
+    Chunk, embed and store already-loaded documents.
+    
+    Args:
+        document_batches: One list of Documents per loaded file (see load_file)
+        files_failed: Number of files that failed to load (reported in stats)
+    
+    Returns:
+        dict with statistics about the ingestion
+    """
+    documents = [doc for docs in document_batches for doc in docs]
+    stats = {
+        "files_processed": len(document_batches),
+        "files_failed": files_failed,
+        "total_chunks": 0,
+        "total_documents": len(documents)
+    }
 
     if not documents:
-        print("\n[WARN] No documents to ingest!")
+        logger.warning("[WARN] No documents to ingest!")
         return stats
     
     # Step 2: Chunking
-    print("\n" + "="*60)
-    print("STEP 2: CHUNKING DOCUMENTS")
-    print("="*60)
-    print(f"Splitting {len(documents)} documents into chunks...")
-    print(f"Chunk size: 1000 characters")
-    print(f"Overlap: 200 characters (to preserve context)")
-    
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
-        length_function=len,
-        separators=["\n\n", "\n", " ", ""]  # Try to split on paragraphs first
-    )
+    logger.info("STEP 2: CHUNKING DOCUMENTS")
+    logger.info("Splitting %d documents into chunks...", len(documents))
+    logger.info("Chunk size: 1000 characters")
+    logger.info("Overlap: 200 characters (to preserve context)")
     
-    splits = text_splitter.split_documents(documents)
-    stats["total_chunks"] = len(splits)
-    print(f"[OK] Created {len(splits)} chunks")
+    # Splits on paragraphs first, then lines, then words (see splitter.py)
+    splits = split_documents(documents, chunk_size=1000, chunk_overlap=200)
+    logger.info("[OK] Created %d chunks", len(splits))
     
     # Step 3: Embedding and Storage
-    print("\n" + "="*60)
-    print("STEP 3: GENERATING EMBEDDINGS & STORING")
-    print("="*60)
+    logger.info("STEP 3: GENERATING EMBEDDINGS & STORING")
     
     embedding_function = get_embeddings()
-    client = get_chroma_client()
+    collection = get_collection("rag_collection")
+    
+    # Content-derived ids make re-ingesting the same file idempotent: chunks
+    # already in the collection are skipped before embedding (the dominant
+    # cost), and identical chunks within a file collapse into one
+    unique = {_chunk_id(doc): doc for doc in reversed(splits)}
+    
+    # Smart batching: sort chunks by length so each encoder batch holds
+    # similar-length texts and is padded only to its own longest chunk.
+    # (Chroma doesn't care about insertion order.)
+    chunks = sorted(unique.items(), key=lambda item: len(item[1].page_content))
+    
+    # Embed and store one batch at a time, so memory stays bounded. Writes
+    # run on a separate thread: while Chroma stores one batch (disk-bound),
+    # the next is already being embedded (CPU/GPU-bound).
+    num_batches = (len(chunks) + INGEST_BATCH_SIZE - 1) // INGEST_BATCH_SIZE
+    logger.info("Embedding and storing %d chunks in %d batches...", len(chunks), num_batches)
+    logger.info("(This may take a minute for large documents)")
     
-    # Use LangChain's Chroma wrapper
-    vector_store = Chroma(
-        client=client,
-        collection_name="rag_collection",
-        embedding_function=embedding_function,
+    write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    write_errors = []
+    writer = threading.Thread(
+        target=_write_batches,
+        args=(collection, write_queue, stats, write_errors),
+        daemon=True
     )
+    writer.start()
     
-    print(f"Adding {len(splits)} chunks to vector database...")
-    print("(This may take a minute for large documents)")
+    skipped = 0
+    try:
+        for n, start in enumerate(range(0, len(chunks), INGEST_BATCH_SIZE), 1):
+            if write_errors:
+                break  # The writer failed; stop embedding
+            batch = chunks[start:start + INGEST_BATCH_SIZE]
+            
+            # Only embed chunks the collection doesn't already have
+            existing = set(collection.get(ids=[chunk_id for chunk_id, _ in batch], include=[])["ids"])
+            if existing:
+                skipped += len(existing)
+                # Re-record them: heals the file index if an earlier write to it failed
+                known = [item for item in batch if item[0] in existing]
+                add_chunks(
+                    [chunk_id for chunk_id, _ in known],
+                    [doc.metadata.get("filename", "") for _, doc in known]
+                )
+                batch = [item for item in batch if item[0] not in existing]
+                if not batch:
+                    logger.info("   Batch %d/%d: already stored", n, num_batches)
+                    continue
+            
+            texts = [doc.page_content for _, doc in batch]
+            write_queue.put((n, num_batches, batch, embedding_function.embed_documents(texts)))
+    finally:
+        write_queue.put(None)  # No more batches
+        writer.join()
     
-    # Add documents
-    vector_store.add_documents(documents=splits)
+    if write_errors:
+        raise write_errors[0]
+
+    # Keep the int8 search mirror in sync with the collection
+    if USE_QUANT_INDEX:
+        build_quant_index()
+
+    # Cached answers may be missing the new documents
+    invalidate_caches()
     
-    print(f"\n[OK] INGESTION COMPLETE!")
-    print(f"   Files processed: {stats['files_processed']}")
-    print(f"   Files failed: {stats['files_failed']}")
-    print(f"   Total chunks stored: {stats['total_chunks']}")
-    print(f"   Database location: {CHROMA_DB_DIR}")
+    logger.info("[OK] INGESTION COMPLETE!")
+    logger.info("   Files processed: %d", stats['files_processed'])
+    logger.info("   Files failed: %d", stats['files_failed'])
+    logger.info("   Total chunks stored: %d", stats['total_chunks'])
+    if skipped:
+        logger.info("   Already stored (skipped): %d", skipped)
+    logger.info("   Database location: %s", CHROMA_DB_DIR)
     
     return stats
 
@@ -160,6 +257,8 @@ if __name__ == "__main__":
     # Test with sample files
     import sys
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     if len(sys.argv) > 1:
         files = sys.argv[1:]
         ingest_files(files)
@@ -0,0 +1,203 @@
+"""
+In-Memory RAG Cache
+
+An optional copy of the whole collection (embeddings, text and metadata)
+held in process memory, so a search never leaves Python.
+
+Key Concept: When to Skip the Database
+---------------------------------------
+For small and medium corpora (up to ~100k chunks) the embeddings fit in
+RAM easily: 10k chunks × 384 dims × 4 bytes = 15MB. Scoring every chunk
+against the query is then one matrix-vector product, which is faster than
+a round-trip through ChromaDB's query path - and the text and metadata
+are already at hand, so nothing needs to be fetched afterwards.
+
+The cache is loaded from ChromaDB on first use and dropped whenever the
+document set changes (see invalidate_caches in backend/rag/ingest.py).
+
+Persistence:
+Reading every chunk back out of ChromaDB is O(N) work on each process
+start (tens of seconds at 100k chunks). After the first load the cache is
+written to CHROMA_DB_DIR/rag_cache/:
+- embeddings.npy  (N × D float32, or int8 with RAG_CACHE_INT8)
+- scales.npy      (N float32, int8 only)
+- chunks.json     (ids, texts and metadatas, same order)
+- meta.json       (row count and format, written last)
+
+Later starts memory-map the embeddings instead, so only the pages a search
+touches are read from disk. The files are deleted with the cache, and
+ignored if the collection's row count no longer matches.
+
+Enable with USE_RAG_CACHE=true.
+
+With RAG_CACHE_INT8=true the embeddings are kept as int8 (plus one scale
+per row) instead of float32: 4× less memory, at a negligible cost in
+ranking accuracy for normalized embeddings.
+
+With RAG_CACHE_NUMBA=true (and numba installed) float32 scoring runs in a
+JIT-compiled, multi-threaded loop instead of NumPy's BLAS call, which can
+win for small embedding sizes where BLAS call overhead dominates.
+"""
+
+from typing import List, Optional, Tuple
+import logging
+import os
+import shutil
+import threading
+
+import numpy as np
+import orjson
+
+from backend.db.chroma import get_collection, CHROMA_DB_DIR
+from backend.rag.vector_index import quantize, quantized_scores, save_array
+
+
+USE_RAG_CACHE = os.getenv("USE_RAG_CACHE", "false").lower() in ("1", "true", "yes")
+RAG_CACHE_INT8 = os.getenv("RAG_CACHE_INT8", "false").lower() in ("1", "true", "yes")
+
+logger = logging.getLogger(__name__)
+
+RAG_CACHE_NUMBA = os.getenv("RAG_CACHE_NUMBA", "false").lower() in ("1", "true", "yes")
+
+CACHE_DIR = os.path.join(CHROMA_DB_DIR, "rag_cache")
+
+_numba_scores = None
+if RAG_CACHE_NUMBA:
+    try:
+        import numba
+
+        @numba.njit(parallel=True, fastmath=True, cache=True)
+        def _numba_scores(embeddings, query):
+            """Dot product of every row with the query, rows split across threads"""
+            n, dim = embeddings.shape
+            sims = np.empty(n, dtype=np.float32)
+            for i in numba.prange(n):
+                total = np.float32(0.0)
+                for j in range(dim):
+                    total += embeddings[i, j] * query[j]
+                sims[i] = total
+            return sims
+    except ImportError:
+        logger.warning("[WARN] RAG_CACHE_NUMBA is set but numba is not installed; using NumPy")
+
+_lock = threading.Lock()
+_cache: Optional[dict] = None  # {"ids", "embeddings", "scales", "texts", "metadatas"}
+
+
+def _load_cache() -> dict:
+    """Read every chunk from the collection into memory"""
+    result = get_collection("rag_collection").get(
+        include=["embeddings", "documents", "metadatas"]
+    )
+    # One contiguous float32 matrix, so scoring is a single BLAS sgemv
+    embeddings = np.ascontiguousarray(result["embeddings"], dtype=np.float32)
+    scales = None
+    if RAG_CACHE_INT8 and len(embeddings):
+        embeddings, scales = quantize(embeddings)
+    logger.info("[RAG CACHE] Loaded %d chunks into memory (%.1fMB)", len(result['ids']), embeddings.nbytes / 1e6)
+    return {
+        "ids": list(result["ids"]),
+        "embeddings": embeddings,
+        "scales": scales,
+        "texts": list(result["documents"]),
+        "metadatas": [meta or {} for meta in result["metadatas"]],
+    }
+
+
+def _save_cache(cache: dict):
+    """Write the cache to CACHE_DIR (meta.json last, so it marks a complete write)"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        save_array(os.path.join(CACHE_DIR, "embeddings.npy"), cache["embeddings"])
+        if cache["scales"] is not None:
+            save_array(os.path.join(CACHE_DIR, "scales.npy"), cache["scales"])
+        chunks = {key: cache[key] for key in ("ids", "texts", "metadatas")}
+        for name, data in (
+            ("chunks.json", chunks),
+            ("meta.json", {"count": len(cache["ids"]), "int8": cache["scales"] is not None}),
+        ):
+            tmp_path = os.path.join(CACHE_DIR, name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp_path, os.path.join(CACHE_DIR, name))
+    except (OSError, TypeError) as e:
+        logger.warning("[WARN] Could not save RAG cache: %s", e)
+
+
+def _read_cache(count: int) -> Optional[dict]:
+    """Memory-map the saved cache, or return None if it is missing or stale"""
+    try:
+        with open(os.path.join(CACHE_DIR, "meta.json"), "rb") as f:
+            meta = orjson.loads(f.read())
+        if meta["count"] != count or meta["int8"] != RAG_CACHE_INT8:
+            return None
+        with open(os.path.join(CACHE_DIR, "chunks.json"), "rb") as f:
+            chunks = orjson.loads(f.read())
+        embeddings = np.load(os.path.join(CACHE_DIR, "embeddings.npy"), mmap_mode="r")
+        scales = None
+        if meta["int8"]:
+            scales = np.load(os.path.join(CACHE_DIR, "scales.npy"), mmap_mode="r")
+    except (OSError, ValueError, KeyError):
+        return None
+
+    if len(chunks["ids"]) != count:
+        return None
+    logger.info("[RAG CACHE] Mapped %d chunks from %s", count, CACHE_DIR)
+    return {"embeddings": embeddings, "scales": scales, **chunks}
+
+
+def _get_cache() -> dict:
+    global _cache
+
+    with _lock:
+        if _cache is None:
+            count = get_collection("rag_collection").count()
+            _cache = _read_cache(count)
+            if _cache is None:
+                _cache = _load_cache()
+                if count:
+                    _save_cache(_cache)
+        return _cache
+
+
+def clear_rag_cache():
+    """Forget the cached collection, in memory and on disk (it is rebuilt on the next search)"""
+    global _cache
+    with _lock:
+        _cache = None
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+def search_rag_cache(query_embedding, k: int, min_cosine: float = -1.0) -> Tuple[List[str], List[dict], np.ndarray]:
+    """
+    Find the k most similar chunks without querying ChromaDB.
+
+    Args:
+        query_embedding: The (normalized) query vector
+        k: Maximum number of results
+        min_cosine: Drop chunks whose cosine similarity is below this
+
+    Returns:
+        (texts, metadatas, cosine similarities), best first
+    """
+    cache = _get_cache()
+    embeddings = cache["embeddings"]
+    if len(cache["ids"]) == 0 or k <= 0:
+        return [], [], np.empty(0, dtype=np.float32)
+
+    if cache["scales"] is not None:
+        sims = quantized_scores(embeddings, cache["scales"], query_embedding)
+    elif _numba_scores is not None:
+        sims = _numba_scores(np.asarray(embeddings), np.asarray(query_embedding, dtype=np.float32))
+    else:
+        # Embeddings are normalized, so the dot product is the cosine similarity
+        sims = embeddings @ np.asarray(query_embedding, dtype=np.float32)
+
+    # Threshold first, then rank only the chunks that passed
+    candidates = np.flatnonzero(sims >= min_cosine)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-sims[candidates], k - 1)[:k]]
+    top = candidates[np.argsort(-sims[candidates])]
+
+    texts, metadatas = cache["texts"], cache["metadatas"]
+    return [texts[i] for i in top], [metadatas[i] for i in top], sims[top]
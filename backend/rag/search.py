@@ -17,10 +17,83 @@ Cosine Similarity:
 - Example: "car" and "automobile" might have similarity of 0.85
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import functools
+import logging
+import threading
+
 from langchain_chroma import Chroma
-from backend.db.chroma import get_chroma_client
+from langchain_core.documents import Document
+from backend.db.chroma import get_chroma_client, get_collection
 from backend.rag.embed import get_embeddings
+from backend.rag.vector_index import USE_QUANT_INDEX, search_quant_index
+from backend.rag.rag_cache import USE_RAG_CACHE, search_rag_cache
+
+# Per-query diagnostics are DEBUG: with lazy %-formatting they cost next to
+# nothing when disabled, unlike a print() on every search
+logger = logging.getLogger(__name__)
+
+
+def _search_quantized(query_embedding, k: int) -> List[Tuple[Document, float]]:
+    """
+    Rank chunks with the int8 mirror, then fetch their text from ChromaDB.
+    
+    Returns (Document, distance) pairs like Chroma's own search. Cosine
+    similarity is converted to the squared L2 distance Chroma would report
+    for normalized vectors (2 - 2·cos), so score filtering is unchanged.
+    """
+    hits = search_quant_index(query_embedding, k)
+    if not hits:
+        return []
+
+    collection = get_collection("rag_collection")
+    payload = collection.get(ids=[chunk_id for chunk_id, _ in hits], include=["documents", "metadatas"])
+    by_id = dict(zip(payload["ids"], zip(payload["documents"], payload["metadatas"])))
+
+    results = []
+    for chunk_id, cosine in hits:
+        if chunk_id in by_id:
+            text, metadata = by_id[chunk_id]
+            results.append((Document(page_content=text, metadata=metadata or {}), 2 - 2 * cosine))
+    return results
+
+
+_vector_store: Optional[Chroma] = None
+_vector_store_lock = threading.Lock()
+
+
+def _get_vector_store() -> Chroma:
+    """Return the shared LangChain Chroma wrapper, creating it on first use"""
+    global _vector_store
+    
+    if _vector_store is None:
+        with _vector_store_lock:
+            if _vector_store is None:  # Another thread may have built it meanwhile
+                _vector_store = Chroma(
+                    client=get_chroma_client(),
+                    collection_name="rag_collection",
+                    embedding_function=get_embeddings(),
+                )
+    return _vector_store
+
+
+def reset_vector_store():
+    """Drop the shared wrapper (its collection handle dies when the database is reset)"""
+    global _vector_store
+    with _vector_store_lock:
+        _vector_store = None
+
+
+@functools.lru_cache(maxsize=4096)
+def embed_query(text: str) -> Tuple[float, ...]:
+    """
+    Embed a query string, caching the result for exact-match repeats.
+    
+    Returns a tuple (hashable and immutable) so the cached value can't be
+    modified by callers. lru_cache is thread-safe, so this is fine to call
+    from FastAPI's worker threads.
+    """
+    return tuple(get_embeddings().embed_query(text))
 
 
 def search_documents(query: str, n_results: int = 5, min_score: float = 0.3) -> List[Dict[str, Any]]:
@@ -42,52 +115,96 @@ def search_documents(query: str, n_results: int = 5, min_score: float = 0.3) ->
             print(result['content'])
             print(result['metadata']['source'])
     """
-    print(f"[SEARCH] Searching for: '{query}'")
-    
     try:
-        client = get_chroma_client()
-        embedding_function = get_embeddings()
-        
-        vector_store = Chroma(
-            client=client,
-            collection_name="rag_collection",
-            embedding_function=embedding_function,
-        )
-        
-        # Perform similarity search with scores
-        results_with_scores = vector_store.similarity_search_with_score(query, k=n_results * 2)
-        
-        # Filter by minimum score threshold
-        # Note: ChromaDB uses distance (lower is better), so we need to convert
-        # For L2 distance, we can use: similarity ≈ 1 / (1 + distance)
-        filtered_results = []
-        for doc, distance in results_with_scores:
-            # Convert distance to similarity score (0-1 range)
-            similarity = 1 / (1 + distance)
-            
-            if similarity >= min_score:
-                filtered_results.append({
-                    "content": doc.page_content,
-                    "metadata": doc.metadata,
-                    "score": similarity
-                })
-        
-        # Limit to n_results after filtering
-        filtered_results = filtered_results[:n_results]
-        
-        if filtered_results:
-            print(f"   [OK] Found {len(filtered_results)} relevant chunks (min score: {min_score:.2f})")
-            print(f"   [INFO] Score range: {filtered_results[-1]['score']:.3f} - {filtered_results[0]['score']:.3f}")
-        else:
-            print(f"   [WARN] No results above threshold {min_score:.2f}")
-        
-        return filtered_results
-        
+        # Identical questions are common in a chatbot; repeats are answered
+        # from the LRU cache (cleared whenever the documents change)
+        return list(_search_documents_cached(query, n_results, min_score))
     except Exception as e:
-        print(f"   [ERROR] Error searching documents: {e}")
+        logger.error("[ERROR] Error searching documents: %s", e)
         return []
 
 
+@functools.lru_cache(maxsize=1024)
+def _search_documents_cached(query: str, n_results: int, min_score: float) -> tuple:
+    """
+    The search itself. Returns a tuple so a caller can't modify the cached
+    result list; errors propagate, so failed searches are never cached.
+    """
+    logger.debug("[SEARCH] Searching for: '%s'", query)
+    
+    if USE_RAG_CACHE:
+        filtered_results = _search_in_memory(query, n_results, min_score)
+        _log_results(filtered_results, min_score)
+        return tuple(filtered_results)
+    
+    vector_store = _get_vector_store()
+    
+    # Perform similarity search with scores
+    # (the query embedding comes from the cache on exact repeats).
+    # Results come back nearest first and the score threshold is monotonic
+    # in distance, so the top n_results are all we ever need to fetch.
+    if USE_QUANT_INDEX:
+        results_with_scores = _search_quantized(embed_query(query), k=n_results)
+    else:
+        results_with_scores = vector_store.similarity_search_by_vector_with_relevance_scores(
+            list(embed_query(query)), k=n_results
+        )
+    
+    # Filter by minimum score threshold
+    # Note: ChromaDB uses distance (lower is better), so we need to convert
+    # For L2 distance, we can use: similarity ≈ 1 / (1 + distance)
+    # The threshold is converted to a distance once instead of converting
+    # every result: similarity >= min_score  <=>  distance <= 1/min_score - 1
+    max_distance = 1 / min_score - 1 if min_score > 0 else float("inf")
+    filtered_results = []
+    for doc, distance in results_with_scores:
+        if distance > max_distance:
+            break  # Everything after this is further away
+        filtered_results.append({
+            "content": doc.page_content,
+            "metadata": doc.metadata,
+            "score": 1 / (1 + distance)
+        })
+    
+    _log_results(filtered_results, min_score)
+    
+    return tuple(filtered_results)
+
+
+def clear_search_cache():
+    """Forget cached search results (call after the document set changes)"""
+    _search_documents_cached.cache_clear()
+
+
+def _search_in_memory(query: str, n_results: int, min_score: float) -> List[Dict[str, Any]]:
+    """
+    search_documents on the in-memory RAG cache.
+    
+    The cache ranks by cosine similarity directly, so instead of converting
+    every result's distance we convert the threshold once. Scores keep the
+    same meaning as the Chroma path: with normalized vectors Chroma's
+    distance is 2 - 2·cos, so 1 / (1 + distance) = 1 / (3 - 2·cos).
+    """
+    min_cosine = (3 - 1 / min_score) / 2 if min_score > 0 else -1.0
+    texts, metadatas, cosines = search_rag_cache(embed_query(query), k=n_results, min_cosine=min_cosine)
+    
+    scores = (1 / (3 - 2 * cosines)).tolist()
+    return [
+        {"content": text, "metadata": metadata, "score": score}
+        for text, metadata, score in zip(texts, metadatas, scores)
+    ]
+
+
+def _log_results(results: List[Dict[str, Any]], min_score: float):
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if results:
+        logger.debug("   [OK] Found %d relevant chunks (min score: %.2f)", len(results), min_score)
+        logger.debug("   [INFO] Score range: %.3f - %.3f", results[-1]['score'], results[0]['score'])
+    else:
+        logger.debug("   [WARN] No results above threshold %.2f", min_score)
+
+
 def search_with_scores(query: str, n_results: int = 5) -> List[tuple]:
     """
     Search with similarity scores (for debugging/analysis).
@@ -96,31 +213,28 @@ def search_with_scores(query: str, n_results: int = 5) -> List[tuple]:
         List of (Document, score) tuples
     """
     try:
-        client = get_chroma_client()
-        embedding_function = get_embeddings()
+        vector_store = _get_vector_store()
         
-        vector_store = Chroma(
-            client=client,
-            collection_name="rag_collection",
-            embedding_function=embedding_function,
+        # Similarity search with scores (distances, lower is better);
+        # the query embedding is shared with search_documents' cache
+        results = vector_store.similarity_search_by_vector_with_relevance_scores(
+            list(embed_query(query)), k=n_results
         )
         
-        # Similarity search with scores
-        results = vector_store.similarity_search_with_score(query, k=n_results)
-        
-        print(f"🔍 Search results with scores:")
+        logger.debug("🔍 Search results with scores:")
         for doc, score in results:
-            print(f"   Score: {score:.3f} | Source: {doc.metadata.get('source', 'unknown')}")
+            logger.debug("   Score: %.3f | Source: %s", score, doc.metadata.get('source', 'unknown'))
         
         return results
         
     except Exception as e:
-        print(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
         return []
 
 
 if __name__ == "__main__":
-    # Test search
+    # Test search (with the per-query diagnostics shown)
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     test_query = "What is the objective of the assignment?"
     results = search_documents(test_query, n_results=3)
     
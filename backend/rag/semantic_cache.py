@@ -0,0 +1,107 @@
+"""
+Semantic Answer Cache
+
+This module caches full RAG answers keyed on the question's embedding.
+
+Key Concept: Semantic Caching
+------------------------------
+Users often ask the same thing in slightly different words:
+- "What is the deadline?"
+- "When is the deadline?"
+
+Their embeddings are almost identical (cosine similarity ~0.97), so we can
+reuse the stored answer instead of running retrieval + LLM generation again.
+
+A cache hit costs one matrix-vector product instead of a multi-second LLM call.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import os
+import threading
+
+import numpy as np
+
+
+# Cosine similarity required to treat two questions as "the same question"
+DEFAULT_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+
+
+class SemanticCache:
+    """
+    LRU cache of RAG results, looked up by cosine similarity of question embeddings.
+
+    Embeddings are kept in a float32 matrix so a lookup is a single
+    matrix-vector product against every cached question.
+    """
+
+    def __init__(self, maxsize: int = 1024, threshold: float = DEFAULT_THRESHOLD):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()  # key -> (embedding, result)
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+        # Lookup matrix, rebuilt lazily after inserts/evictions
+        self._keys: List[int] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def get(self, embedding) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for the most similar question, or None on a miss.
+
+        Args:
+            embedding: The question embedding (list or array of floats)
+        """
+        q = np.asarray(embedding, dtype=np.float32)
+        q_norm = np.linalg.norm(q)
+        if q_norm == 0:
+            return None
+
+        with self._lock:
+            if not self._entries:
+                return None
+
+            if self._matrix is None:
+                self._keys = list(self._entries.keys())
+                vectors = np.stack([self._entries[k][0] for k in self._keys])
+                # Store unit vectors so cosine similarity is a plain dot product
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                self._matrix = vectors / norms
+
+            sims = self._matrix @ (q / q_norm)
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+
+            key = self._keys[best]
+            self._entries.move_to_end(key)  # Mark as recently used
+            return self._entries[key][1]
+
+    def put(self, embedding, result: Dict[str, Any]) -> None:
+        """Store a result for a question embedding, evicting the oldest entry if full."""
+        vector = np.asarray(embedding, dtype=np.float32)
+
+        with self._lock:
+            self._entries[self._next_key] = (vector, result)
+            self._next_key += 1
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+            self._matrix = None
+
+    def clear(self) -> None:
+        """Drop every cached answer (call after the document set changes)."""
+        with self._lock:
+            self._entries.clear()
+            self._keys = []
+            self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache shared by the planner agent
+answer_cache = SemanticCache()
@@ -0,0 +1,91 @@
+"""
+Text Splitter
+
+Splits documents into overlapping ~1000 character chunks for embedding.
+
+Key Concept: Greedy Window Splitting
+-------------------------------------
+LangChain's RecursiveCharacterTextSplitter splits the whole text on "\\n\\n",
+then re-splits oversized pieces on "\\n", then " ", then merges the pieces
+back together - allocating a substring at every level. On a large corpus
+that takes seconds.
+
+This splitter does the same job in a single pass per document:
+
+    1. Look at the next chunk_size characters
+    2. Cut at the LAST paragraph break in that window
+       (or line break, or space - whichever exists, in that order)
+    3. Start the next chunk chunk_overlap characters before the cut,
+       at a word boundary
+
+Every search is a str.rfind/re.search running in C, and only the final
+chunks are ever copied out of the text.
+"""
+
+from typing import List
+import re
+
+from langchain_core.documents import Document
+
+
+# Cut points, best first
+SEPARATORS = ("\n\n", "\n", " ")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def split_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> List[str]:
+    """
+    Split text into chunks of at most chunk_size characters.
+
+    Consecutive chunks share up to chunk_overlap characters so context
+    isn't lost at the boundary.
+    """
+    chunks = []
+    n = len(text)
+    pos = 0
+    prev_end = 0  # Where the last emitted chunk's text ends
+
+    while pos < n:
+        end = pos + chunk_size
+        if end >= n:
+            cut = n
+        else:
+            # Cut at the best separator in the window, past the overlap (so
+            # the next chunk always moves forward) and past the previous
+            # chunk's end (so this one holds some new text)
+            start = max(pos + chunk_overlap + 1, prev_end + 1)
+            cut = -1
+            for sep in SEPARATORS:
+                cut = text.rfind(sep, start, end)
+                if cut != -1:
+                    break
+            if cut == -1:
+                cut = end  # One long word: hard cut
+
+        chunk = text[pos:cut]
+        chunk_end = pos + len(chunk.rstrip())
+        # A window that adds nothing past the previous chunk would only
+        # repeat part of it (e.g. after an overlap with no word boundary)
+        if chunk_end > prev_end and chunk.strip():
+            chunks.append(chunk.strip())
+            prev_end = chunk_end
+        if cut >= n:
+            break
+
+        # Next chunk starts chunk_overlap characters back, at a word start
+        pos = max(cut - chunk_overlap, pos + 1)
+        match = _WHITESPACE.search(text, pos, cut)
+        if match:
+            pos = match.end()
+
+    return chunks
+
+
+def split_documents(documents: List[Document], chunk_size: int = 1000, chunk_overlap: int = 200) -> List[Document]:
+    """Split each Document into chunk Documents that keep its metadata"""
+    return [
+        Document(page_content=chunk, metadata=dict(doc.metadata))
+        for doc in documents
+        for chunk in split_text(doc.page_content, chunk_size, chunk_overlap)
+    ]
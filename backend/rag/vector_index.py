@@ -0,0 +1,191 @@
+"""
+Quantized Vector Index
+
+An optional int8 mirror of the ChromaDB embeddings for fast similarity search.
+
+Key Concept: Quantization
+--------------------------
+Embeddings are float32 (4 bytes per number). With all-MiniLM-L6-v2 that's
+384 × 4 = 1.5KB per chunk. Most of that precision isn't needed for ranking.
+
+Int8 quantization stores each vector as 1-byte integers plus one scale:
+    vector ≈ int8_values × scale
+
+That's 4× less memory and disk bandwidth, and the ranking barely changes.
+
+Storage:
+- CHROMA_DB_DIR/quant/embeddings_i8.npy  (N × D int8)
+- CHROMA_DB_DIR/quant/scales.npy         (N float32, one scale per vector)
+- CHROMA_DB_DIR/quant/ids.json           (N chunk ids, same order)
+
+The arrays are memory-mapped, so startup is instant and only the pages
+touched by a search are loaded into RAM.
+
+Enable with USE_QUANT_INDEX=true.
+"""
+
+from typing import List, Optional, Tuple
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from backend.db.chroma import get_collection, CHROMA_DB_DIR
+
+
+logger = logging.getLogger(__name__)
+
+USE_QUANT_INDEX = os.getenv("USE_QUANT_INDEX", "false").lower() in ("1", "true", "yes")
+
+QUANT_DIR = os.path.join(CHROMA_DB_DIR, "quant")
+
+# Rows upcast to float32 at a time when scoring (bounds temporary memory)
+_BLOCK_ROWS = 16384
+
+_lock = threading.Lock()
+_index: Optional[dict] = None  # {"ids", "embeddings", "scales"}
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-vector int8 quantization.
+
+    Each row is scaled so its largest absolute value maps to 127
+    (zero point is always 0 because embeddings are centred around zero).
+
+    Returns:
+        (int8 array with the same shape, float32 scale per row)
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    max_abs = np.abs(vectors).max(axis=1)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales
+
+
+def save_array(path: str, array: np.ndarray):
+    """Write an array atomically so a reader never sees a half-written file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def build_quant_index() -> int:
+    """
+    Rebuild the int8 mirror from the document collection.
+
+    Returns:
+        Number of vectors indexed
+    """
+    global _index
+
+    collection = get_collection("rag_collection")
+    result = collection.get(include=["embeddings"])
+    ids = list(result["ids"])
+    embeddings = np.asarray(result["embeddings"], dtype=np.float32)
+
+    if ids:
+        quantized, scales = quantize(embeddings)
+    else:
+        quantized = np.zeros((0, 0), dtype=np.int8)
+        scales = np.zeros(0, dtype=np.float32)
+
+    os.makedirs(QUANT_DIR, exist_ok=True)
+    save_array(os.path.join(QUANT_DIR, "embeddings_i8.npy"), quantized)
+    save_array(os.path.join(QUANT_DIR, "scales.npy"), scales)
+    tmp_path = os.path.join(QUANT_DIR, "ids.json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(ids, f)
+    os.replace(tmp_path, os.path.join(QUANT_DIR, "ids.json"))
+
+    _index = None  # Reload (memory-mapped) on next search
+    logger.info("[QUANT] Indexed %d vectors as int8", len(ids))
+    return len(ids)
+
+
+def _load_index() -> Optional[dict]:
+    """Memory-map the int8 mirror from disk, or return None if it doesn't exist"""
+    try:
+        with open(os.path.join(QUANT_DIR, "ids.json")) as f:
+            ids = json.load(f)
+        return {
+            "ids": ids,
+            "embeddings": np.load(os.path.join(QUANT_DIR, "embeddings_i8.npy"), mmap_mode="r"),
+            "scales": np.load(os.path.join(QUANT_DIR, "scales.npy"), mmap_mode="r"),
+        }
+    except (OSError, ValueError):
+        return None
+
+
+def _get_index() -> dict:
+    """
+    Return the loaded index, rebuilding it if it is missing or stale.
+
+    The collection's row count is used as a cheap staleness check: ingestion
+    rebuilds the mirror directly, and deletions change the count.
+    """
+    global _index
+
+    with _lock:
+        count = get_collection("rag_collection").count()
+        if _index is None:
+            _index = _load_index()
+        if _index is None or len(_index["ids"]) != count:
+            build_quant_index()
+            _index = _load_index()
+        return _index
+
+
+def quantized_scores(embeddings: np.ndarray, scales: np.ndarray, query_embedding) -> np.ndarray:
+    """
+    Cosine similarity of a query against every row of an int8 matrix.
+
+    Args:
+        embeddings: (N, D) int8 rows from quantize()
+        scales: (N,) per-row scales from quantize()
+        query_embedding: The (normalized) query vector
+
+    Returns:
+        (N,) float32 similarities
+    """
+    q_i8, q_scale = quantize(query_embedding)
+    q = q_i8[0].astype(np.float32)
+
+    # int8 · int8 dot products, computed block by block in float32 BLAS.
+    # For D <= 1040 every partial sum stays below 2^24, so float32 holds
+    # the exact int32 result.
+    n = len(embeddings)
+    raw = np.empty(n, dtype=np.float32)
+    for start in range(0, n, _BLOCK_ROWS):
+        block = embeddings[start:start + _BLOCK_ROWS]
+        raw[start:start + len(block)] = block.astype(np.float32) @ q
+    return raw * (q_scale[0] * scales)
+
+
+def search_quant_index(query_embedding, k: int) -> List[Tuple[str, float]]:
+    """
+    Find the k most similar chunks using the int8 mirror.
+
+    Args:
+        query_embedding: The query vector
+        k: Number of results
+
+    Returns:
+        List of (chunk_id, cosine_similarity) tuples, best first
+        (cosine assumes normalized embeddings, which get_embeddings uses)
+    """
+    index = _get_index()
+    ids = index["ids"]
+    n = len(ids)
+    if n == 0 or k <= 0:
+        return []
+
+    sims = quantized_scores(index["embeddings"], index["scales"], query_embedding)
+
+    k = min(k, n)
+    top = np.argpartition(-sims, k - 1)[:k]
+    top = top[np.argsort(-sims[top])]
+    return [(ids[i], float(sims[i])) for i in top]
@@ -0,0 +1,66 @@
+"""Tests for the DOCX loader's XML text extraction"""
+
+import io
+
+from docx import Document as DocxDocument
+from docx.oxml import parse_xml
+
+from backend.loaders.docx import load_docx
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+WPS_NS = "http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+
+# A run holding a text box, stored as a modern Choice and a legacy Fallback
+TEXT_BOX_RUN = f"""
+<w:r xmlns:w="{W_NS}" xmlns:mc="{MC_NS}" xmlns:wps="{WPS_NS}">
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps">
+      <w:drawing><wps:txbx><w:txbxContent>
+        <w:p><w:r><w:t>Boxed text</w:t></w:r></w:p>
+      </w:txbxContent></wps:txbx></w:drawing>
+    </mc:Choice>
+    <mc:Fallback>
+      <w:pict><w:txbxContent>
+        <w:p><w:r><w:t>Boxed text</w:t></w:r></w:p>
+      </w:txbxContent></w:pict>
+    </mc:Fallback>
+  </mc:AlternateContent>
+</w:r>
+"""
+
+
+def _docx_bytes(build) -> io.BytesIO:
+    doc = DocxDocument()
+    build(doc)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    buffer.name = "test.docx"
+    return buffer
+
+
+def test_tabs_and_line_breaks_separate_words():
+    def build(doc):
+        run = doc.add_paragraph().add_run("Name")
+        run.add_tab()
+        run.add_text("Value")
+        run.add_break()
+        run.add_text("Next line")
+
+    docs = load_docx(_docx_bytes(build))
+
+    assert docs[0].page_content == "Name\tValue\nNext line"
+
+
+def test_text_box_is_read_once():
+    def build(doc):
+        paragraph = doc.add_paragraph("Before")
+        paragraph._p.append(parse_xml(TEXT_BOX_RUN))
+        doc.add_paragraph("After")
+
+    docs = load_docx(_docx_bytes(build))
+
+    assert docs[0].page_content == "Before\nBoxed text\nAfter"
+    assert docs[0].metadata["paragraphs"] == 2
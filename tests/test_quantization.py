@@ -0,0 +1,46 @@
+"""Round-trip tests for the int8 embedding quantization"""
+
+import numpy as np
+
+from backend.rag.vector_index import quantize, quantized_scores
+
+
+def _normalized(rows: int, dim: int = 384, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).normal(size=(rows, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_round_trip_error_is_at_most_half_a_step():
+    vectors = _normalized(200)
+
+    quantized, scales = quantize(vectors)
+    restored = quantized.astype(np.float32) * scales[:, None]
+
+    assert quantized.dtype == np.int8
+    assert scales.shape == (200,)
+    # Rounding to the nearest step: each value is off by at most scale / 2
+    error = np.abs(restored - vectors)
+    assert np.all(error <= scales[:, None] / 2 + 1e-7)
+
+
+def test_zero_vector_round_trips():
+    quantized, scales = quantize(np.zeros((1, 8), dtype=np.float32))
+
+    assert np.all(quantized == 0)
+    assert np.all(np.isfinite(scales))
+
+
+def test_quantized_scores_match_cosine_similarity():
+    vectors = _normalized(1000)
+    query = _normalized(1, seed=1)[0]
+
+    quantized, scales = quantize(vectors)
+    approx = quantized_scores(quantized, scales, query)
+    exact = vectors @ query
+
+    assert approx.shape == exact.shape
+    assert np.max(np.abs(approx - exact)) < 0.01
+    # The best matches are (almost) unchanged
+    top_exact = set(np.argsort(-exact)[:10])
+    top_approx = set(np.argsort(-approx)[:10])
+    assert len(top_exact & top_approx) >= 9
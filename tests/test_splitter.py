@@ -0,0 +1,96 @@
+"""Tests for the single-pass text splitter"""
+
+import random
+import string
+
+from backend.rag.splitter import split_text
+
+
+def _words(prefix: str, count: int) -> str:
+    """Distinct words, so no stretch of text repeats (substring checks stay meaningful)"""
+    return " ".join(f"{prefix}{i}" for i in range(count))
+
+
+def _overlap(first: str, second: str) -> int:
+    """Length of the longest suffix of first that is a prefix of second"""
+    for size in range(min(len(first), len(second)), 0, -1):
+        if first.endswith(second[:size]):
+            return size
+    return 0
+
+
+def test_short_text_is_one_chunk():
+    assert split_text("Hello world.") == ["Hello world."]
+    assert split_text("   \n\n  ") == []
+
+
+def test_prefers_paragraph_breaks():
+    first = _words("a", 100)   # ~390 characters
+    second = _words("b", 100)
+    third = _words("c", 200)
+
+    chunks = split_text(f"{first}\n\n{second}\n\n{third}")
+
+    # The first window holds two whole paragraphs; it is cut after the second
+    assert chunks[0] == f"{first}\n\n{second}"
+
+
+def test_prefers_line_breaks_over_spaces():
+    lines = [_words(f"l{i}x", 12) for i in range(40)]
+
+    chunks = split_text("\n".join(lines))
+
+    for chunk in chunks[:-1]:
+        assert chunk.split("\n")[-1] in lines  # Every chunk ends on a whole line
+
+
+def test_consecutive_chunks_overlap():
+    chunks = split_text(_words("w", 1000), chunk_size=1000, chunk_overlap=200)
+
+    assert len(chunks) > 2
+    for first, second in zip(chunks, chunks[1:]):
+        assert 0 < _overlap(first, second) <= 200
+
+
+def test_hard_cut_without_separators():
+    random.seed(0)
+    text = "".join(random.choices(string.ascii_letters, k=2500))
+
+    chunks = split_text(text, chunk_size=1000, chunk_overlap=200)
+
+    assert chunks[0] == text[:1000]
+    assert chunks[1] == text[800:1800]
+    assert chunks[-1].endswith(text[-100:])
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+
+
+def test_no_chunk_is_contained_in_its_predecessor():
+    # A short paragraph with no word boundary to start the overlap at used
+    # to produce a second chunk that only repeated the end of the first
+    text = "x" * 210 + "\n\n" + _words("w", 600)
+
+    chunks = split_text(text)
+
+    assert chunks[0] == "x" * 210
+    for first, second in zip(chunks, chunks[1:]):
+        assert second not in first
+
+
+def test_random_texts_keep_invariants():
+    random.seed(1)
+    separators = [" "] * 20 + ["\n"] * 3 + ["\n\n"]
+    for trial in range(50):
+        parts = []
+        for i in range(random.randint(50, 800)):
+            token = f"t{trial}_{i}" + "z" * random.choice([0, 0, 0, 50, 300])
+            parts.append(token + random.choice(separators))
+        text = "".join(parts)
+
+        chunks = split_text(text, chunk_size=1000, chunk_overlap=200)
+
+        assert all(0 < len(chunk) <= 1000 for chunk in chunks)
+        for first, second in zip(chunks, chunks[1:]):
+            assert second not in first
+        # Nothing is lost: every token appears in some chunk
+        joined = "\n".join(chunks)
+        assert all(part.strip() in joined for part in parts)
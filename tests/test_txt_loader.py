@@ -0,0 +1,53 @@
+"""Tests for the block-wise TXT loader"""
+
+import io
+
+from backend.loaders import txt
+from backend.loaders.txt import BLOCK_SIZE, load_txt
+
+
+def _source(data: bytes) -> io.BytesIO:
+    source = io.BytesIO(data)
+    source.name = "test.txt"
+    return source
+
+
+def test_multibyte_character_split_at_block_boundary():
+    # "€" is 3 bytes in UTF-8; put it across the first 1MB read
+    line = "x" * 99 + "\n"
+    prefix = line * (BLOCK_SIZE // len(line)) + "y" * (BLOCK_SIZE % len(line) - 1)
+    text = prefix + "€ after the boundary\n" + line * 10
+    data = text.encode("utf-8")
+    assert data[BLOCK_SIZE - 1:BLOCK_SIZE + 2] == "€".encode("utf-8")
+
+    docs = load_txt(_source(data))
+
+    assert len(docs) == 2
+    assert "".join(doc.page_content for doc in docs) == text
+    assert docs[1].page_content.startswith("y")  # Carried over from the first block
+
+
+def test_documents_concatenate_to_the_original(monkeypatch):
+    text = "héllo wörld\n\nline€two\nthree 😀 end " * 20
+
+    for size in range(1, 40):
+        monkeypatch.setattr(txt, "BLOCK_SIZE", size)
+        blocks = list(txt._read_blocks(io.BytesIO(text.encode("utf-8"))))
+        assert "".join(blocks) == text
+
+    docs = load_txt(_source(text.encode("utf-8")))
+    assert "".join(doc.page_content for doc in docs) == text
+
+
+def test_small_file_is_one_document():
+    docs = load_txt(_source(b"hello world"))
+
+    assert [doc.page_content for doc in docs] == ["hello world"]
+    assert docs[0].metadata == {"source": "test.txt"}
+
+
+def test_blank_file_has_no_documents(tmp_path):
+    path = tmp_path / "blank.txt"
+    path.write_bytes(b"  \n\n ")
+
+    assert load_txt(str(path)) == []